@@ -0,0 +1,370 @@
+# ===============================/ arch_search.py /======================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Busca de arquiteturas sob o orçamento do Nano (arena de 12KB, 100 ms/amostra).
+#       Para cada candidata calcula parâmetros, MACs, arena e flash estimados e a
+#       latência medida no host; treina as candidatas em paralelo com orçamento curto
+#       e reporta a fronteira de Pareto acurácia (validação) x custo. As coletas de
+#       teste só avaliam as candidatas da fronteira, no relatório final.
+# =======================================================================================
+
+import itertools
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Módulos Locais
+import data_loader
+import preprocessing
+from config import CSV_PATH, TRAIN_COLETAS, TEST_COLETAS, FEATURES, TARGET_COL, STEP
+
+# 0. Configurações da Busca ---------------------------------------------------
+# Espaço de busca (produto cartesiano de todas as opções)
+CELULAS = ['lstm', 'gru']
+UNIDADES = [(64, 32), (32, 16), (32,), (16,), (8,)]
+FRONTENDS = [None, 'conv1d']
+JANELAS = [50, 30, 20]          # 5 s, 3 s e 2 s a 10 Hz
+DENSA = 16
+
+# Front-end Conv1D (mesmos valores padrão de model.build_model_variant)
+CONV_FILTROS = 8
+CONV_KERNEL = 5
+CONV_STRIDE = 2
+
+# Orçamento curto de treino por candidata
+EPOCHS_BUSCA = 3
+BATCH_SIZE = 64
+MAX_JANELAS_TREINO = 5000       # Subamostra aleatória das janelas de treino
+N_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Coletas de treino reservadas para pontuar as candidatas (seleção sem olhar o teste)
+VALIDACAO_COLETAS = TRAIN_COLETAS[-2:]
+THREADS_POR_WORKER = 1
+SEED = 42
+
+# Restrições do Nano 33 BLE (nRF52840, Cortex-M4F a 64 MHz) - ver TinyML.ino
+NANO_ARENA_BYTES = 12 * 1024    # kTensorArenaSize
+NANO_FLASH_BYTES = 1024 * 1024  # Flash total do nRF52840
+NANO_RUNTIME_FLASH_BYTES = 300 * 1024  # Sketch + TFLM + bibliotecas (IMU, SD)
+NANO_CLOCK_HZ = 64_000_000
+PERIODO_AMOSTRA_MS = 100        # delay(100) no loop -> ~10 Hz
+
+# Constantes de calibração das estimativas (kernels float32 de referência do TFLM)
+CICLOS_POR_MAC = 8
+BYTES_POR_VALOR = 4             # float32
+ARENA_OVERHEAD_BYTES = 2048     # Interpretador, metadados de tensores e dados por op
+FLATBUFFER_OVERHEAD_BYTES = 512 # Por camada, no model_data.h
+
+# Repetições para medir a latência no host
+REPETICOES_LATENCIA = 50
+
+ARQUIVO_RESULTADOS = 'resultados_busca_arquitetura.csv'
+
+
+# 1. Espaço de candidatas -----------------------------------------------------
+def gerar_candidatas() -> list[dict]:
+    """Gera todas as combinações do espaço de busca como dicionários."""
+    candidatas = []
+    for celula, unidades, frontend, janela in itertools.product(CELULAS, UNIDADES, FRONTENDS, JANELAS):
+        candidatas.append({
+            'celula': celula,
+            'unidades': unidades,
+            'frontend': frontend,
+            'janela': janela,
+            'densa': DENSA,
+        })
+    return candidatas
+
+
+def nome_candidata(c: dict) -> str:
+    """Nome curto e legível (ex: 'conv1d+gru16x8-d16-w30')."""
+    corpo = c['celula'] + 'x'.join(str(u) for u in c['unidades'])
+    if c['frontend']:
+        corpo = f"{c['frontend']}+{corpo}"
+    return f"{corpo}-d{c['densa']}-w{c['janela']}"
+
+
+# 2. Custo analítico (não precisa do TensorFlow) -----------------------------
+def estimar_custo(c: dict, n_features: int) -> dict:
+    """
+    Calcula parâmetros, MACs por inferência e estimativas de arena, flash e
+    latência no Nano a partir da especificação da candidata.
+
+    A arena considera que os pesos ficam na flash (model_data.h) e que o
+    planejador do TFLM reaproveita memória entre operações: o pico é a maior
+    soma entrada + saída + scratch de uma camada, mais os estados recorrentes
+    (persistentes) e um overhead fixo. O conversor emite a sequência completa
+    de cada LSTM/GRU, mesmo na última camada.
+    """
+    passos, canais = c['janela'], n_features
+    params, macs, n_camadas = 0, 0, 0
+    pico_ativacoes, persistente = 0, 0
+    entrada = passos * canais
+
+    # Front-end convolucional
+    if c['frontend'] == 'conv1d':
+        passos_saida = (passos - CONV_KERNEL) // CONV_STRIDE + 1
+        params += CONV_KERNEL * canais * CONV_FILTROS + CONV_FILTROS
+        macs += passos_saida * CONV_FILTROS * CONV_KERNEL * canais
+        saida = passos_saida * CONV_FILTROS
+        pico_ativacoes = max(pico_ativacoes, entrada + saida)
+        passos, canais, entrada = passos_saida, CONV_FILTROS, saida
+        n_camadas += 1
+
+    # Camadas recorrentes (4 portas na LSTM, 3 na GRU com reset_after)
+    portas = 4 if c['celula'] == 'lstm' else 3
+    estados = 2 if c['celula'] == 'lstm' else 1
+    for u in c['unidades']:
+        params += portas * (u * (canais + u) + u)
+        if c['celula'] == 'gru':
+            params += portas * u  # Segundo bias (reset_after=True)
+        macs += passos * portas * u * (canais + u)
+        saida = passos * u
+        scratch = portas * u
+        pico_ativacoes = max(pico_ativacoes, entrada + saida + scratch)
+        persistente += estados * u
+        canais, entrada = u, saida
+        n_camadas += 1
+
+    # Camadas densas (apenas o último passo chega aqui)
+    for n_in, n_out in [(canais, c['densa']), (c['densa'] or canais, 1)]:
+        if n_out == 0:
+            continue
+        params += n_in * n_out + n_out
+        macs += n_in * n_out
+        pico_ativacoes = max(pico_ativacoes, entrada + n_out)
+        entrada = n_out
+        n_camadas += 1
+
+    arena = (pico_ativacoes + persistente) * BYTES_POR_VALOR + ARENA_OVERHEAD_BYTES
+    flash = params * BYTES_POR_VALOR + n_camadas * FLATBUFFER_OVERHEAD_BYTES
+    latencia_nano_ms = macs * CICLOS_POR_MAC / NANO_CLOCK_HZ * 1000
+
+    return {
+        'parametros': params,
+        'macs': macs,
+        'arena_bytes': arena,
+        'flash_bytes': flash,
+        'latencia_nano_ms': latencia_nano_ms,
+        'cabe_no_nano': (arena <= NANO_ARENA_BYTES
+                         and flash + NANO_RUNTIME_FLASH_BYTES <= NANO_FLASH_BYTES
+                         and latencia_nano_ms <= PERIODO_AMOSTRA_MS),
+    }
+
+
+# 3. Fronteira de Pareto ------------------------------------------------------
+def fronteira_pareto(df: pd.DataFrame, custo: str = 'macs', qualidade: str = 'acuracia') -> pd.Series:
+    """
+    Marca as candidatas não dominadas: nenhuma outra tem custo menor ou igual
+    e qualidade maior ou igual, com pelo menos uma das duas estritamente melhor.
+    """
+    ordem = df.sort_values([custo, qualidade], ascending=[True, False]).index
+    na_fronteira = pd.Series(False, index=df.index)
+    melhor_qualidade = -np.inf
+    for idx in ordem:
+        if df.at[idx, qualidade] > melhor_qualidade:
+            na_fronteira[idx] = True
+            melhor_qualidade = df.at[idx, qualidade]
+    return na_fronteira
+
+
+# 4. Trabalhadores paralelos (um processo por worker, dados carregados uma vez) -
+_DF_TREINO = None
+_DF_VALIDACAO = None
+_DF_TESTE = None
+_DIR_PESOS = None
+_CACHE_JANELAS = {}
+_CACHE_TESTE = {}
+
+
+def _inicializar_worker(df_treino: pd.DataFrame, df_validacao: pd.DataFrame, df_teste: pd.DataFrame,
+                        dir_pesos: str):
+    """Recebe os dados já normalizados e limita as threads do TensorFlow."""
+    global _DF_TREINO, _DF_VALIDACAO, _DF_TESTE, _DIR_PESOS
+    _DF_TREINO, _DF_VALIDACAO, _DF_TESTE, _DIR_PESOS = df_treino, df_validacao, df_teste, dir_pesos
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(THREADS_POR_WORKER)
+    tf.config.threading.set_inter_op_parallelism_threads(THREADS_POR_WORKER)
+
+
+def _janelas(janela: int) -> tuple:
+    """Cria (uma vez por worker) as sequências de treino e validação para uma janela."""
+    if janela not in _CACHE_JANELAS:
+        X_train, y_train = preprocessing.create_sequences(_DF_TREINO, FEATURES, TARGET_COL, janela, STEP)
+        X_val, y_val = preprocessing.create_sequences(_DF_VALIDACAO, FEATURES, TARGET_COL, janela, STEP)
+
+        if len(X_train) > MAX_JANELAS_TREINO:
+            idx = np.random.default_rng(SEED).choice(len(X_train), MAX_JANELAS_TREINO, replace=False)
+            X_train, y_train = X_train[idx], y_train[idx]
+
+        _CACHE_JANELAS[janela] = (X_train.astype(np.float32), y_train,
+                                  X_val.astype(np.float32), y_val)
+    return _CACHE_JANELAS[janela]
+
+
+def _janelas_teste(janela: int) -> tuple:
+    """Cria (uma vez por worker) as sequências de teste para uma janela."""
+    if janela not in _CACHE_TESTE:
+        X_test, y_test = preprocessing.create_sequences(_DF_TESTE, FEATURES, TARGET_COL, janela, STEP)
+        _CACHE_TESTE[janela] = (X_test.astype(np.float32), y_test)
+    return _CACHE_TESTE[janela]
+
+
+def _construir(c: dict):
+    """Constrói (sem compilar) a variante descrita pela candidata."""
+    import model as model_builder
+
+    return model_builder.build_model_variant(
+        c['janela'], len(FEATURES),
+        celula=c['celula'], unidades=c['unidades'], densa=c['densa'], frontend=c['frontend'],
+        conv_filtros=CONV_FILTROS, conv_kernel=CONV_KERNEL, conv_stride=CONV_STRIDE,
+    )
+
+
+def _medir_latencia_host(model, janela: int, n_features: int) -> float:
+    """Mediana (ms) de uma inferência com lote 1, já compilada em grafo."""
+    import tensorflow as tf
+
+    inferir = tf.function(lambda x: model(x, training=False))
+    x = tf.zeros((1, janela, n_features), dtype=tf.float32)
+    inferir(x)  # Aquecimento (traçado do grafo)
+
+    tempos = []
+    for _ in range(REPETICOES_LATENCIA):
+        inicio = time.perf_counter()
+        inferir(x).numpy()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return float(np.median(tempos))
+
+
+def _avaliar_candidata(c: dict) -> dict:
+    """
+    Treina com orçamento curto, avalia nas coletas de validação e mede a
+    latência no host. Os pesos ficam em disco para o relatório de teste.
+    """
+    import tensorflow as tf
+    import model as model_builder
+
+    tf.keras.utils.set_random_seed(SEED)
+    X_train, y_train, X_val, y_val = _janelas(c['janela'])
+
+    model = model_builder.compile_model(_construir(c))
+
+    inicio = time.perf_counter()
+    model.fit(X_train, y_train, epochs=EPOCHS_BUSCA, batch_size=BATCH_SIZE, verbose=0)
+    tempo_treino = time.perf_counter() - inicio
+
+    _, acuracia = model.evaluate(X_val, y_val, verbose=0)
+    model.save_weights(os.path.join(_DIR_PESOS, f"{nome_candidata(c)}.weights.h5"))
+
+    return {
+        'acuracia': float(acuracia),
+        'parametros_keras': int(model.count_params()),
+        'latencia_host_ms': _medir_latencia_host(model, c['janela'], len(FEATURES)),
+        'tempo_treino_s': tempo_treino,
+    }
+
+
+def _avaliar_no_teste(c: dict) -> float:
+    """Acurácia nas coletas de teste de uma candidata já treinada (pesos salvos)."""
+    # Sem compilar: só os pesos das camadas são necessários para a inferência
+    model = _construir(c)
+    model.load_weights(os.path.join(_DIR_PESOS, f"{nome_candidata(c)}.weights.h5"))
+    X_test, y_test = _janelas_teste(c['janela'])
+    y_pred = (model.predict(X_test, verbose=0) > 0.5).astype(int).flatten()
+    return float(np.mean(y_pred == y_test))
+
+
+# 5. Tabela de resultados -----------------------------------------------------
+def imprimir_tabela(df: pd.DataFrame):
+    """Imprime a tabela da busca, ordenada por custo (MACs)."""
+    print("\n--- Tabela de Resultados (Busca de Arquitetura) ---")
+    print("=" * 129)
+    print(f"| {'Candidata':<28} | {'Params':>7} | {'MACs':>9} | {'Arena (B)':>9} | {'Flash (B)':>9} "
+          f"| {'Nano (ms)':>9} | {'Host (ms)':>9} | {'Acc. val':>8} | {'Acc. teste':>10} | Pareto | Nano |")
+    print("-" * 129)
+    for _, r in df.sort_values('macs').iterrows():
+        teste = f"{r['acuracia_teste'] * 100:>9.2f}%" if r['pareto'] else f"{'-':>10}"
+        print(f"| {r['nome']:<28} | {r['parametros']:>7} | {r['macs']:>9} | {r['arena_bytes']:>9} "
+              f"| {r['flash_bytes']:>9} | {r['latencia_nano_ms']:>9.1f} | {r['latencia_host_ms']:>9.2f} "
+              f"| {r['acuracia'] * 100:>7.2f}% | {teste} | {'*' if r['pareto'] else '':^6} "
+              f"| {'sim' if r['cabe_no_nano'] else 'não':^4} |")
+    print("=" * 129)
+    print(f"(Nano: arena <= {NANO_ARENA_BYTES} B e inferência estimada <= {PERIODO_AMOSTRA_MS} ms; "
+          f"Pareto: acurácia de validação (coletas {VALIDACAO_COLETAS}) x MACs; teste só na fronteira)")
+
+
+# 6. Execução Principal -------------------------------------------------------
+def main():
+    print("Iniciando busca de arquiteturas sob o orçamento do Nano...")
+
+    candidatas = gerar_candidatas()
+    print(f"{len(candidatas)} candidatas, {N_WORKERS} workers, {EPOCHS_BUSCA} épocas cada.")
+
+    # Carregamento e normalização (mesmo fluxo de main.py), feitos uma única vez
+    df = data_loader.load_data(CSV_PATH)
+    if df.empty:
+        return
+    df = data_loader.add_features(df)
+    df_train, df_test = data_loader.split_data_by_coleta(df, TRAIN_COLETAS, TEST_COLETAS)
+
+    # Parte das coletas de treino pontua as candidatas; o teste fica para o relatório final
+    df_val = df_train[df_train['ID_Coleta'].isin(VALIDACAO_COLETAS)]
+    df_fit = df_train[~df_train['ID_Coleta'].isin(VALIDACAO_COLETAS)]
+    print(f"Coletas de Validação da busca: {VALIDACAO_COLETAS} (Total de {len(df_val)} linhas)")
+
+    scaler = preprocessing.get_scaler(df_fit, FEATURES)
+    colunas = ['ID_Coleta', TARGET_COL] + FEATURES
+    df_fit_scaled = preprocessing.scale_data(df_fit, scaler, FEATURES)[colunas]
+    df_val_scaled = preprocessing.scale_data(df_val, scaler, FEATURES)[colunas]
+    df_test_scaled = preprocessing.scale_data(df_test, scaler, FEATURES)[colunas]
+
+    # Treino em paralelo ('spawn' evita herdar o estado do TensorFlow do processo pai)
+    resultados = []
+    with tempfile.TemporaryDirectory() as dir_pesos, \
+         ProcessPoolExecutor(max_workers=N_WORKERS,
+                             mp_context=mp.get_context('spawn'),
+                             initializer=_inicializar_worker,
+                             initargs=(df_fit_scaled, df_val_scaled, df_test_scaled, dir_pesos)) as executor:
+        futuros = {executor.submit(_avaliar_candidata, c): c for c in candidatas}
+        for i, futuro in enumerate(as_completed(futuros), start=1):
+            c = futuros[futuro]
+            linha = {'nome': nome_candidata(c), **c, **estimar_custo(c, len(FEATURES)), **futuro.result()}
+            resultados.append(linha)
+            print(f"[{i}/{len(candidatas)}] {linha['nome']}: acurácia (validação) {linha['acuracia'] * 100:.2f}%")
+
+        df_resultados = pd.DataFrame(resultados)
+        df_resultados['pareto'] = fronteira_pareto(df_resultados)
+
+        # Arena e flash estimadas dependem da contagem analítica: confere com a do Keras
+        divergentes = df_resultados.loc[df_resultados['parametros'] != df_resultados['parametros_keras'], 'nome']
+        if len(divergentes):
+            print(f"Aviso: parâmetros estimados diferem do Keras em {len(divergentes)} candidatas: "
+                  f"{', '.join(divergentes)}")
+        else:
+            print(f"Parâmetros estimados conferem com o Keras nas {len(df_resultados)} candidatas.")
+
+        # Relatório final: só as candidatas selecionadas são avaliadas no teste
+        por_nome = {nome_candidata(c): c for c in candidatas}
+        futuros = {idx: executor.submit(_avaliar_no_teste, por_nome[df_resultados.at[idx, 'nome']])
+                   for idx in df_resultados.index[df_resultados['pareto']]}
+        df_resultados['acuracia_teste'] = np.nan
+        for idx, futuro in futuros.items():
+            df_resultados.at[idx, 'acuracia_teste'] = futuro.result()
+
+    imprimir_tabela(df_resultados)
+
+    df_resultados.to_csv(ARQUIVO_RESULTADOS, index=False)
+    print(f"Resultados salvos em '{ARQUIVO_RESULTADOS}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# ==============================/ bench_startup.py /=====================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Benchmark de inicialização: roda cada ponto de entrada rápido com
+#       'python -X importtime', resume o tempo de import e falha se uma biblioteca
+#       pesada (TensorFlow, matplotlib, ...) for carregada ou o limite for excedido
+# =======================================================================================
+
+import argparse
+import os
+import subprocess
+import sys
+
+# 0. Configurações do Benchmark -----------------------------------------------
+LSTM_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTE_DIR = os.path.join(LSTM_DIR, '..', 'Teste_Mecanico')
+
+# Pontos de entrada que não podem carregar bibliotecas pesadas: nome -> (diretório, argumentos)
+ENTRADAS = {
+    'import main': (LSTM_DIR, ['-c', 'import main']),
+    'import arch_search': (LSTM_DIR, ['-c', 'import arch_search']),
+    'main.py verificar': (LSTM_DIR, ['main.py', 'verificar']),
+    'Estabilidade.py --sem-grafico': (TESTE_DIR, ['Estabilidade.py', '--sem-grafico']),
+    'Fidelidade.py --sem-grafico': (TESTE_DIR, ['Fidelidade.py', '--sem-grafico']),
+    'Frequencia.py --sem-grafico': (TESTE_DIR, ['Frequencia.py', '--sem-grafico']),
+}
+
+# Pacotes que só devem ser importados pelas etapas que realmente os usam
+PESADOS = ('tensorflow', 'keras', 'matplotlib', 'sklearn', 'scipy')
+
+LIMITE_MS = 1500.0          # Tempo máximo de import por ponto de entrada
+N_REPETICOES = 3            # Mantém a menor medição (reduz o ruído do sistema)
+N_MAIORES = 2               # Pacotes mais caros listados por entrada
+
+
+# 1. Medição ------------------------------------------------------------------
+def _ler_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Converte as linhas 'import time:' em (módulo, nível, próprio_us, acumulado_us)."""
+    registros = []
+    for linha in stderr.splitlines():
+        if not linha.startswith('import time:'):
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        if not proprio.strip().isdigit():
+            continue  # Cabeçalho
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        registros.append((nome.strip(), nivel, int(proprio), int(acumulado)))
+    return registros
+
+
+def medir(diretorio: str, argumentos: list) -> dict:
+    """Roda um ponto de entrada com -X importtime e resume os imports."""
+    melhor = None
+    for _ in range(N_REPETICOES):
+        resultado = subprocess.run(
+            [sys.executable, '-X', 'importtime', *argumentos],
+            cwd=diretorio, capture_output=True, text=True,
+            env={**os.environ, 'MPLBACKEND': 'Agg'},
+        )
+        if resultado.returncode != 0:
+            raise RuntimeError(f"{' '.join(argumentos)} falhou:\n{resultado.stderr[-2000:]}")
+
+        registros = _ler_importtime(resultado.stderr)
+        total_ms = sum(r[2] for r in registros) / 1000
+        if melhor is None or total_ms < melhor['total_ms']:
+            melhor = {'total_ms': total_ms, 'registros': registros}
+
+    # Tempo próprio somado por pacote raiz ('pandas.core.frame' -> 'pandas')
+    por_pacote = {}
+    for nome, _, proprio, _ in melhor['registros']:
+        raiz = nome.split('.')[0]
+        por_pacote[raiz] = por_pacote.get(raiz, 0) + proprio
+    maiores = sorted(por_pacote.items(), key=lambda item: -item[1])[:N_MAIORES]
+    melhor['maiores'] = [(pacote, us / 1000) for pacote, us in maiores]
+    melhor['pesados'] = sorted(set(por_pacote) & set(PESADOS))
+    return melhor
+
+
+# 2. Execução Principal -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark (e guarda) do tempo de inicialização.")
+    parser.add_argument('--limite-ms', type=float, default=LIMITE_MS,
+                        help="Falha se alguma entrada passar deste tempo de import")
+    args = parser.parse_args()
+
+    falhas = []
+    print("\n--- Tabela de Resultados (Tempo de Import) ---")
+    print("=" * 78)
+    print(f"| {'Ponto de entrada':<30} | {'Import (ms)':>11} | {'Mais caros (ms)':<27} |")
+    print("-" * 78)
+    for nome, (diretorio, argumentos) in ENTRADAS.items():
+        r = medir(diretorio, argumentos)
+        maiores = ', '.join(f"{pacote} {ms:.0f}" for pacote, ms in r['maiores'])
+        print(f"| {nome:<30} | {r['total_ms']:>11.0f} | {maiores:<27.27} |")
+
+        if r['pesados']:
+            falhas.append(f"{nome}: importou {', '.join(r['pesados'])}")
+        if r['total_ms'] > args.limite_ms:
+            falhas.append(f"{nome}: {r['total_ms']:.0f} ms > limite de {args.limite_ms:.0f} ms")
+    print("=" * 78)
+
+    if falhas:
+        print("\nFALHA na guarda de inicialização:")
+        for falha in falhas:
+            print(f"  - {falha}")
+        sys.exit(1)
+    print(f"OK: nenhuma biblioteca pesada ({', '.join(PESADOS)}) e todos abaixo de {args.limite_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
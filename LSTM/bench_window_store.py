@@ -0,0 +1,154 @@
+# ============================/ bench_window_store.py /==================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Benchmark do window_store: grava datasets sintéticos de tamanho crescente
+#       (até além da RAM), percorre uma época embaralhada completa de cada um e mede
+#       a vazão, a memória residente e o crescimento do page cache
+# =======================================================================================
+
+import argparse
+import os
+import resource
+import shutil
+import time
+
+import pandas as pd
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+# Módulos Locais
+import window_store
+from config import FEATURES, TARGET_COL, WINDOW_SIZE, STEP
+
+# 0. Configurações do Benchmark -----------------------------------------------
+BATCH_SIZE = 64
+
+HORAS_POR_COLETA = 1
+AMOSTRAS_POR_S = 10
+FRACOES_RAM = [0.25, 0.5, 1.5]  # Tamanhos padrão, em frações da RAM total (o último passa dela)
+AMOSTRAR_A_CADA = 100           # Lotes entre leituras de memória (RSS e page cache)
+
+
+# 1. Dados sintéticos (gerados coleta a coleta, nunca todos em memória) --------
+def gerar_coletas(n_coletas: int, seed: int = 0):
+    """Gera coletas de 'HORAS_POR_COLETA' horas com sinal aleatório e blocos de tremor."""
+    rng = np.random.default_rng(seed)
+    n = HORAS_POR_COLETA * 3600 * AMOSTRAS_POR_S
+    for i in range(1, n_coletas + 1):
+        tremor = (np.cumsum(rng.random(n) < 0.001) % 2).astype(np.int8)
+        dados = rng.standard_normal((n, len(FEATURES))).astype(np.float32)
+        df = pd.DataFrame(dados, columns=FEATURES)
+        df['ID_Coleta'] = i
+        df[TARGET_COL] = tremor
+        yield df
+
+
+def memoria_total_mb() -> float:
+    """RAM física total (MB), quando o sistema informa."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2**20
+    except (ValueError, OSError, AttributeError):
+        return float('nan')
+
+
+def page_cache_mb() -> float:
+    """Page cache atual do sistema ('Cached' de /proc/meminfo, MB), quando disponível."""
+    try:
+        with open('/proc/meminfo') as f:
+            for linha in f:
+                if linha.startswith('Cached:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+
+def rss_atual_mb() -> float:
+    """Memória residente atual do processo (MB), lida de /proc quando disponível."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# 2. Medição ------------------------------------------------------------------
+def medir(tamanho_mb: int, diretorio: str) -> dict:
+    """
+    Grava um store de ~'tamanho_mb' MB e percorre uma época embaralhada
+    completa (todos os grupos de shards), medindo vazão, RSS máximo e o
+    maior crescimento do page cache em relação ao início da época.
+    """
+    bytes_por_coleta = HORAS_POR_COLETA * 3600 * AMOSTRAS_POR_S * len(FEATURES) * 4
+    n_coletas = max(1, int(tamanho_mb * 2**20 // bytes_por_coleta))
+
+    scaler = StandardScaler().fit(next(gerar_coletas(1))[FEATURES])
+    inicio = time.perf_counter()
+    store = window_store.write_store(
+        gerar_coletas(n_coletas), scaler, FEATURES, TARGET_COL, WINDOW_SIZE, STEP, diretorio
+    )
+    tempo_escrita = time.perf_counter() - inicio
+
+    # Começa "a frio": grava as páginas pendentes e tira os shards do page cache
+    os.sync()
+    window_store.drop_page_cache(store)
+    cache_inicial = page_cache_mb()
+
+    rss_max, cache_max, n_janelas = 0.0, cache_inicial, 0
+    inicio = time.perf_counter()
+    for i, (X, y, *_) in enumerate(window_store.iter_batches(store, BATCH_SIZE, shuffle=True, epochs=1)):
+        n_janelas += len(y)
+        if i % AMOSTRAR_A_CADA == 0:
+            rss_max = max(rss_max, rss_atual_mb())
+            cache_max = max(cache_max, page_cache_mb())
+    tempo = time.perf_counter() - inicio
+
+    return {
+        'tamanho_mb': tamanho_mb,
+        'coletas': n_coletas,
+        'janelas': n_janelas,
+        'escrita_s': tempo_escrita,
+        'epoca_s': tempo,
+        'janelas_por_s': n_janelas / tempo,
+        'rss_max_mb': rss_max,
+        'cache_max_mb': cache_max - cache_inicial,
+    }
+
+
+# 3. Execução Principal -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de vazão do window_store.")
+    parser.add_argument('--fracoes-ram', type=float, nargs='+', default=FRACOES_RAM,
+                        help="Tamanhos dos datasets como frações da RAM total (valores > 1 passam da RAM)")
+    parser.add_argument('--tamanhos-mb', type=int, nargs='+',
+                        help="Tamanhos explícitos dos datasets (MB); substitui --fracoes-ram")
+    parser.add_argument('--diretorio', default='data/bench_store', help="Onde gravar os shards temporários")
+    args = parser.parse_args()
+
+    ram_mb = memoria_total_mb()
+    tamanhos = args.tamanhos_mb or [int(fracao * ram_mb) for fracao in args.fracoes_ram]
+
+    print(f"RAM total: {ram_mb:.0f} MB | Lote: {BATCH_SIZE} | Uma época completa por tamanho")
+    resultados = []
+    for tamanho in tamanhos:
+        resultados.append(medir(tamanho, args.diretorio))
+        shutil.rmtree(args.diretorio, ignore_errors=True)
+
+    print("\n--- Tabela de Resultados (Vazão do Window Store) ---")
+    print("=" * 118)
+    print(f"| {'Dataset (MB)':>12} | {'x RAM':>5} | {'Coletas':>7} | {'Janelas':>10} | {'Escrita (s)':>11} "
+          f"| {'Época (s)':>9} | {'Janelas/s':>10} | {'RSS máx (MB)':>12} | {'Cache +(MB)':>11} |")
+    print("-" * 118)
+    for r in resultados:
+        print(f"| {r['tamanho_mb']:>12} | {r['tamanho_mb'] / ram_mb:>5.2f} | {r['coletas']:>7} | {r['janelas']:>10} "
+              f"| {r['escrita_s']:>11.1f} | {r['epoca_s']:>9.1f} | {r['janelas_por_s']:>10.0f} "
+              f"| {r['rss_max_mb']:>12.0f} | {r['cache_max_mb']:>11.0f} |")
+    print("=" * 118)
+    print("(Cache +: maior crescimento do page cache durante a época; vazão, RSS e cache estáveis com o")
+    print(" aumento do dataset indicam leitura limitada aos shards ativos)")
+
+
+if __name__ == "__main__":
+    main()
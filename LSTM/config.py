@@ -0,0 +1,24 @@
+# =================================/ config.py /=========================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Configurações compartilhadas (main.py, arch_search.py, bench_window_store.py):
+#       dataset, divisão das coletas, features e janela deslizante
+# =======================================================================================
+
+# 1. Dados --------------------------------------------------------------------
+CSV_PATH = 'data/exemplo_artificial.csv'  # -> alterar para csv desejado
+
+# Divisão dos dados (8 para treino, 2 para teste)
+TRAIN_COLETAS = [1, 2, 3, 4, 5, 6, 7, 8]
+TEST_COLETAS = [9, 10]
+
+# Features que a LSTM usará
+FEATURES = ['Roll (x)', 'Pitch (y)', 'Yaw (z)', 'Magnitude']
+TARGET_COL = 'Tremor'
+
+
+# 2. Janela deslizante --------------------------------------------------------
+WINDOW_SIZE = 50    # 10 amostras/segundo * 5 segundos = 50 amostras
+STEP = 10           # Desliza a janela em 1 segundo (10 amostras)
@@ -11,9 +11,12 @@ import numpy as np
 
 # 1. Carrega os dados ---------------------------------------------------------
 def load_data(csv_path: str) -> pd.DataFrame:
-    """Carrega os dados do arquivo CSV."""
+    """Carrega os dados do arquivo CSV (ou Parquet, gerado por ingestion.py)."""
     try:
-        df = pd.read_csv(csv_path)
+        if csv_path.lower().endswith('.parquet'):
+            df = pd.read_parquet(csv_path)
+        else:
+            df = pd.read_csv(csv_path)
     except FileNotFoundError:
         print(f"Erro: Arquivo não encontrado em {csv_path}")
         return pd.DataFrame()
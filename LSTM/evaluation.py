@@ -0,0 +1,211 @@
+# ===============================/ evaluation.py /=======================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Métricas por evento: leva as previsões das janelas de volta ao eixo 'Time (s)'
+#       e mede atraso de detecção do início do tremor, episódios perdidos e falsos
+#       por hora e erro de duração dos episódios
+# =======================================================================================
+
+import pandas as pd
+import numpy as np
+
+# Tamanho dos blocos lidos por vez na codificação run-length (memória limitada)
+CHUNK_SIZE = 1_000_000
+
+# Tolerância após o fim de um episódio real para ainda considerá-lo detectado (s)
+TOLERANCE_S = 5.0
+
+
+# 1. Codificação run-length (vetorizada e por blocos) -------------------------
+def run_length_encode(values, chunk_size: int = CHUNK_SIZE) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Codifica uma sequência em corridas (início, comprimento, valor).
+    Lê 'values' em blocos de 'chunk_size' (aceita np.memmap), de modo que a
+    memória usada depende do número de corridas, não do tamanho da entrada.
+    """
+    n = len(values)
+    if n == 0:
+        vazio = np.array([], dtype=np.int64)
+        return vazio, vazio, np.array([])
+
+    all_starts, all_values = [], []
+    last_value = None
+
+    for ini in range(0, n, chunk_size):
+        chunk = np.asarray(values[ini : ini + chunk_size])
+
+        # Posições onde o valor muda dentro do bloco (mais o início do bloco)
+        starts = np.concatenate(([0], np.flatnonzero(chunk[1:] != chunk[:-1]) + 1))
+        run_values = chunk[starts]
+
+        # Corrida que continua do bloco anterior não abre uma nova
+        if last_value is not None and run_values[0] == last_value:
+            starts, run_values = starts[1:], run_values[1:]
+
+        all_starts.append(starts + ini)
+        all_values.append(run_values)
+        last_value = chunk[-1]
+
+    starts = np.concatenate(all_starts)
+    lengths = np.diff(np.append(starts, n))
+    return starts, lengths, np.concatenate(all_values)
+
+
+# 2. Episódios no eixo do tempo -----------------------------------------------
+def extract_episodes(binary, positions_to_time, n_positions: int, period_s: float,
+                     chunk_size: int = CHUNK_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converte as corridas de '1' em episódios (início, fim) em segundos.
+    'positions_to_time' mapeia índices (amostra ou janela) para 'Time (s)';
+    o fim é o instante da próxima posição, ou a última + 'period_s'.
+    """
+    starts, lengths, run_values = run_length_encode(binary, chunk_size)
+    positive = run_values == 1
+    starts, ends = starts[positive], starts[positive] + lengths[positive]
+
+    onsets = positions_to_time(starts)
+    offsets = np.where(
+        ends < n_positions,
+        positions_to_time(np.minimum(ends, n_positions - 1)),
+        positions_to_time(np.full_like(ends, n_positions - 1)) + period_s,
+    )
+    return onsets, offsets
+
+
+def _count_windows(n_samples: int, window_size: int, step: int) -> int:
+    """Número de janelas de uma coleta, igual a preprocessing.create_sequences."""
+    return len(range(0, n_samples - window_size, step))
+
+
+# 3. Associação entre episódios reais e previstos ----------------------------
+def _match_episodes(true_on, true_off, pred_on, pred_off, tolerance_s: float) -> tuple:
+    """
+    Para cada episódio real, encontra o primeiro episódio previsto que termina
+    depois do início real e começa antes do fim real (+ tolerância).
+    Retorna (detectado, atraso, índice previsto) por episódio real e a máscara
+    de episódios previstos sem nenhum episódio real correspondente (falsos).
+    """
+    detected = np.zeros(len(true_on), dtype=bool)
+    delay = np.full(len(true_on), np.nan)
+    k = np.zeros(len(true_on), dtype=np.int64)
+    false_mask = np.ones(len(pred_on), dtype=bool)
+    if len(true_on) == 0 or len(pred_on) == 0:
+        return detected, delay, k, false_mask
+
+    # Episódios previstos não se sobrepõem, então 'pred_off' já está ordenado
+    k = np.searchsorted(pred_off, true_on, side='right')
+    found = k < len(pred_on)
+    k = np.minimum(k, len(pred_on) - 1)
+    detected = found & (pred_on[k] < true_off + tolerance_s)
+    delay = np.where(detected, np.maximum(pred_on[k] - true_on, 0.0), np.nan)
+
+    # Falso: nenhum episódio real (estendido pela tolerância) sobrepõe o previsto
+    i = np.searchsorted(true_off + tolerance_s, pred_on, side='right')
+    found = i < len(true_on)
+    i = np.minimum(i, len(true_on) - 1)
+    false_mask = ~(found & (true_on[i] < pred_off))
+
+    return detected, delay, k, false_mask
+
+
+# 4. Métricas por evento ------------------------------------------------------
+def event_metrics(df: pd.DataFrame,
+                  y_pred: np.ndarray,
+                  target_col: str,
+                  window_size: int,
+                  step: int,
+                  tolerance_s: float = TOLERANCE_S,
+                  chunk_size: int = CHUNK_SIZE) -> tuple[dict, pd.DataFrame]:
+    """
+    Calcula as métricas por evento a partir das previsões por janela.
+    'y_pred' deve seguir a ordem de preprocessing.create_sequences (coleta a
+    coleta). Cada janela é decidida no instante da sua última amostra e vale
+    até a decisão seguinte, como no buffer deslizante do TinyML.ino.
+    Retorna um resumo e uma tabela com um registro por episódio real.
+    """
+    episodes, n_false, total_hours, offset = [], 0, 0.0, 0
+
+    for coleta_id, positions in df.groupby('ID_Coleta', sort=False).indices.items():
+        time_s = df['Time (s)'].values[positions]
+        labels = df[target_col].values[positions]
+        n_samples = len(time_s)
+        period_s = float(np.median(np.diff(time_s))) if n_samples > 1 else 0.0
+        total_hours += (time_s[-1] - time_s[0] + period_s) / 3600 if n_samples else 0.0
+
+        n_windows = _count_windows(n_samples, window_size, step)
+        preds = y_pred[offset : offset + n_windows]
+        offset += n_windows
+
+        # Episódios reais (eixo das amostras) e previstos (eixo das decisões)
+        true_on, true_off = extract_episodes(
+            labels, lambda idx: time_s[idx], n_samples, period_s, chunk_size
+        )
+        pred_on, pred_off = extract_episodes(
+            preds, lambda k: time_s[k * step + window_size - 1], n_windows, step * period_s, chunk_size
+        )
+
+        detected, delay, k, false_mask = _match_episodes(true_on, true_off, pred_on, pred_off, tolerance_s)
+        n_false += int(false_mask.sum())
+
+        pred_duration = (pred_off[k] - pred_on[k]) if len(pred_on) else np.zeros(len(true_on))
+        true_duration = true_off - true_on
+        episodes.append(pd.DataFrame({
+            'ID_Coleta': coleta_id,
+            'Inicio (s)': true_on,
+            'Duracao Real (s)': true_duration,
+            'Detectado': detected,
+            'Atraso (s)': delay,
+            'Erro Duracao (s)': np.where(detected, pred_duration - true_duration, np.nan),
+        }))
+
+    if offset != len(y_pred):
+        raise ValueError(f"y_pred tem {len(y_pred)} janelas, mas os dados geram {offset} "
+                         f"(WINDOW_SIZE={window_size}, STEP={step}).")
+
+    # Sem coletas: tabela vazia, mas com as colunas usadas abaixo e pelos relatórios
+    df_episodes = pd.concat(episodes, ignore_index=True) if episodes else pd.DataFrame(columns=[
+        'ID_Coleta', 'Inicio (s)', 'Duracao Real (s)', 'Detectado', 'Atraso (s)', 'Erro Duracao (s)'
+    ])
+    delays = df_episodes['Atraso (s)'].dropna().values
+    duration_errors = df_episodes['Erro Duracao (s)'].dropna().values
+    n_true = len(df_episodes)
+    n_missed = int((~df_episodes['Detectado']).sum()) if n_true else 0
+
+    summary = {
+        'horas': total_hours,
+        'episodios_reais': n_true,
+        'episodios_detectados': n_true - n_missed,
+        'sensibilidade_eventos': (n_true - n_missed) / n_true if n_true else np.nan,
+        'perdidos_por_hora': n_missed / total_hours if total_hours else np.nan,
+        'falsos': n_false,
+        'falsos_por_hora': n_false / total_hours if total_hours else np.nan,
+        'atraso_mediano_s': float(np.median(delays)) if len(delays) else np.nan,
+        'atraso_p90_s': float(np.percentile(delays, 90)) if len(delays) else np.nan,
+        'atraso_max_s': float(np.max(delays)) if len(delays) else np.nan,
+        'erro_duracao_medio_s': float(np.mean(duration_errors)) if len(duration_errors) else np.nan,
+        'erro_duracao_abs_medio_s': float(np.mean(np.abs(duration_errors))) if len(duration_errors) else np.nan,
+    }
+    return summary, df_episodes
+
+
+# 5. Relatório ----------------------------------------------------------------
+def print_event_report(summary: dict):
+    """Imprime o resumo das métricas por evento em forma de tabela."""
+    print("\n--- Tabela de Resultados (Métricas por Evento) ---")
+    print("=" * 50)
+    print(f"| Horas avaliadas              | {summary['horas']:>15.2f} |")
+    print(f"| Episódios reais              | {summary['episodios_reais']:>15d} |")
+    print(f"| Episódios detectados         | {summary['episodios_detectados']:>15d} |")
+    print(f"| Sensibilidade por evento (%) | {summary['sensibilidade_eventos'] * 100:>15.2f} |")
+    print(f"| Perdidos por hora            | {summary['perdidos_por_hora']:>15.2f} |")
+    print(f"| Falsos por hora              | {summary['falsos_por_hora']:>15.2f} |")
+    print("-" * 50)
+    print(f"| Atraso mediano (s)           | {summary['atraso_mediano_s']:>15.2f} |")
+    print(f"| Atraso P90 (s)               | {summary['atraso_p90_s']:>15.2f} |")
+    print(f"| Atraso máximo (s)            | {summary['atraso_max_s']:>15.2f} |")
+    print(f"| Erro de duração médio (s)    | {summary['erro_duracao_medio_s']:>15.2f} |")
+    print(f"| Erro de duração absoluto (s) | {summary['erro_duracao_abs_medio_s']:>15.2f} |")
+    print("=" * 50)
+    print("(Atraso = tempo entre o início real do tremor e a primeira janela que o sinaliza)")
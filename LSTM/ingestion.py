@@ -0,0 +1,220 @@
+# ================================/ ingestion.py /=======================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Ingestão dos logs brutos do cartão SD: varre um diretório, normaliza o
+#       cabeçalho dos firmwares, repara linhas truncadas e monta um único dataset
+#       (com ID_Coleta, dispositivo e sessão) para o LSTM e o Teste_Mecanico
+# =======================================================================================
+
+import argparse
+import io
+import importlib.util
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+# Motor de leitura: pyarrow (multithread) quando instalado, senão o motor C do pandas
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+N_WORKERS = os.cpu_count() or 1
+CHUNKSIZE = 16              # Arquivos enviados por vez a cada processo
+THREADS_POR_WORKER = 1      # Com vários processos, o paralelismo já vem dos arquivos
+LINHAS_REFERENCIA = 64      # Linhas anteriores consultadas para validar a última linha sem '\n'
+
+# Cabeçalho dos firmwares -> nomes usados pelo LSTM (após remover espaços)
+COLUMN_MAP = {
+    'Roll (x)': 'Roll (x)',
+    'Row (x)': 'Roll (x)',     # Cabeçalho com erro de digitação em logs antigos do UNO
+    'Pitch (Y)': 'Pitch (y)',
+    'Yaw (Z)': 'Yaw (z)',
+    'Time (s)': 'Time (s)',
+}
+SIGNAL_COLS = ['Roll (x)', 'Pitch (y)', 'Yaw (z)', 'Time (s)']
+
+# Colunas extras do TinyML.ino (Prediction/Probability só a cada STEP_SIZE linhas)
+OPTIONAL_COLS = ['Magnitude', 'Prediction', 'Probability', 'Tremor']
+
+# Nomes curtos usados pelos scripts do Teste_Mecanico
+SHORT_NAMES = {'Roll (x)': 'roll', 'Pitch (y)': 'pitch', 'Yaw (z)': 'yaw', 'Time (s)': 'tempo_s'}
+
+# Gravação interrompida do 'blocoRegistro': linha cortada + bytes nulos + lixo,
+# com a próxima linha válida colada logo depois
+_TRUNCATED_WRITE = re.compile(rb'\x00+[^\r\n0-9.\-]*')
+
+# Linhas do TinyML.ino sem predição terminam em ',,,' (um campo a mais que o cabeçalho)
+_TINYML_EMPTY_TAIL = re.compile(rb',,,(\r?\n|$)')
+
+# Valor numérico como os firmwares gravam (String(valor, casas)): grupo 1 = casas decimais
+_NUMBER = re.compile(rb'-?\d+(?:\.(\d+))?')
+
+_DEVICE = re.compile(r'(NANO|UNO)', re.IGNORECASE)
+
+
+# 1. Leitura e reparo de um log -----------------------------------------------
+def _repair(raw: bytes) -> bytes:
+    """Descarta as linhas cortadas por gravações interrompidas no SD (no meio ou no fim do log)."""
+    if b'\x00' in raw:
+        # Corta do início da linha interrompida até o fim do lixo após os nulos
+        partes, fim_anterior = [], 0
+        nulo = raw.find(b'\x00')
+        while nulo != -1:
+            fim = _TRUNCATED_WRITE.match(raw, nulo).end()
+            inicio_linha = raw.rfind(b'\n', fim_anterior, nulo) + 1
+            partes.append(raw[fim_anterior:max(inicio_linha, fim_anterior)])
+            partes.append(b'\n')
+            fim_anterior = fim
+            nulo = raw.find(b'\x00', fim)
+        partes.append(raw[fim_anterior:])
+        raw = b''.join(partes)
+    if not raw.endswith(b'\n') and not _complete_last_line(raw):
+        raw = raw[:raw.rfind(b'\n') + 1]
+    if b',,,' in raw:
+        raw = _TINYML_EMPTY_TAIL.sub(rb',,\1', raw)
+    return raw
+
+
+def _complete_last_line(raw: bytes) -> bool:
+    """
+    Indica se a última linha (sem '\\n' no fim) está completa. Uma gravação
+    interrompida pode cortá-la no meio de um número (ex.: '0.2' -> '0') e ela
+    ainda seria lida como válida; só o último campo preenchido pode estar
+    cortado, então ele deve ter as mesmas casas decimais da mesma coluna na
+    linha anterior que a preenche (os firmwares gravam cada coluna com casas
+    fixas; no TinyML.ino a predição só aparece a cada STEP_SIZE linhas).
+    """
+    quebra = raw.rfind(b'\n')
+    if quebra == -1:
+        return True  # Só o cabeçalho
+    campos = [campo.strip() for campo in raw[quebra + 1:].split(b',')]
+    preenchidos = [i for i, campo in enumerate(campos) if campo]
+    if not preenchidos:
+        return False
+    j = preenchidos[-1]
+
+    ultimo = _NUMBER.fullmatch(campos[j])
+    if ultimo is None:
+        return False
+
+    fim = quebra
+    for _ in range(LINHAS_REFERENCIA):
+        inicio = raw.rfind(b'\n', 0, fim) + 1
+        anterior = raw[inicio:fim].split(b',')
+        if j < len(anterior) and anterior[j].strip():
+            referencia = _NUMBER.fullmatch(anterior[j].strip())
+            return referencia is not None and len(ultimo.group(1) or b'') == len(referencia.group(1) or b'')
+        if inicio == 0:
+            break
+        fim = inicio - 1
+    return False
+
+
+def read_log(path) -> pd.DataFrame:
+    """
+    Lê um log do cartão SD (Final_UNO, Final_Nano ou TinyML) com o cabeçalho
+    normalizado e colunas numéricas em float32. Linhas com número errado de
+    campos ou valores não numéricos são descartadas.
+    """
+    raw = _repair(Path(path).read_bytes())
+    df = pd.read_csv(io.BytesIO(raw), engine=CSV_ENGINE, on_bad_lines='skip')
+
+    # Limpa nomes de colunas (' Pitch (Y)' -> 'Pitch (y)')
+    df.columns = [COLUMN_MAP.get(col.strip(), col.strip()) for col in df.columns]
+    faltando = [col for col in SIGNAL_COLS if col not in df.columns]
+    if faltando:
+        raise ValueError(f"{path}: colunas ausentes {faltando}")
+
+    colunas = SIGNAL_COLS + [col for col in OPTIONAL_COLS if col in df.columns]
+    df = df[colunas]
+
+    # Só converte texto quando algum valor corrompido impediu a leitura numérica
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        df = df.apply(pd.to_numeric, errors='coerce')
+    df = df.astype(np.float32)
+
+    if df[SIGNAL_COLS].isna().values.any():
+        df = df.dropna(subset=SIGNAL_COLS).reset_index(drop=True)
+    return df
+
+
+def _session_metadata(path: Path, root: str) -> tuple[str, str]:
+    """Sessão (caminho relativo sem extensão) e dispositivo inferido do nome."""
+    sessao = path.relative_to(root).with_suffix('').as_posix()
+    dispositivo = _DEVICE.search(sessao)
+    return sessao, dispositivo.group(1).upper() if dispositivo else 'DESCONHECIDO'
+
+
+# 2. Montagem do dataset ------------------------------------------------------
+def _inicializar_worker():
+    """Limita as threads do leitor pyarrow (evita N_WORKERS x núcleos threads no total)."""
+    if CSV_ENGINE == 'pyarrow':
+        import pyarrow
+        pyarrow.set_cpu_count(THREADS_POR_WORKER)
+
+
+def find_logs(root: str) -> list[Path]:
+    """Lista (em ordem) todos os .csv/.CSV abaixo de 'root'."""
+    return sorted(p for p in Path(root).rglob('*') if p.is_file() and p.suffix.lower() == '.csv')
+
+
+def build_dataset(root: str, n_workers: int = N_WORKERS) -> pd.DataFrame:
+    """
+    Lê todos os logs de 'root' em paralelo e os concatena em um único DataFrame.
+    O ID_Coleta é atribuído a partir de 1, na ordem dos caminhos, então o mesmo
+    diretório sempre gera os mesmos IDs.
+    """
+    arquivos = find_logs(root)
+    if not arquivos:
+        print(f"Erro: Nenhum log encontrado em {root}")
+        return pd.DataFrame()
+
+    if n_workers > 1 and len(arquivos) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_inicializar_worker) as executor:
+            sessoes = list(executor.map(read_log, arquivos, chunksize=CHUNKSIZE))
+    else:
+        sessoes = [read_log(path) for path in arquivos]
+
+    # Metadados montados uma única vez (categóricos), em vez de texto por linha
+    linhas = np.array([len(s) for s in sessoes])
+    sessao, dispositivo = zip(*(_session_metadata(path, root) for path in arquivos))
+    df = pd.concat(sessoes, ignore_index=True)
+    df.insert(0, 'ID_Coleta', np.repeat(np.arange(1, len(arquivos) + 1, dtype=np.int32), linhas))
+    dispositivos, codigos = np.unique(dispositivo, return_inverse=True)
+    df.insert(1, 'Dispositivo', pd.Categorical.from_codes(np.repeat(codigos, linhas), categories=dispositivos))
+    df.insert(2, 'Sessao', pd.Categorical.from_codes(np.repeat(np.arange(len(arquivos)), linhas), categories=sessao))
+
+    print(f"{len(arquivos)} logs lidos de '{root}' (Total de {len(df)} linhas)")
+    return df
+
+
+def save_dataset(df: pd.DataFrame, path: str):
+    """Salva em Parquet (se o pyarrow estiver instalado) ou CSV, pela extensão."""
+    if Path(path).suffix.lower() == '.parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    print(f"Dataset salvo em '{path}'")
+
+
+# 3. Execução Principal -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Monta um dataset único a partir dos logs do cartão SD.")
+    parser.add_argument('diretorio', help="Diretório com os logs brutos (busca recursiva)")
+    parser.add_argument('saida', help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument('--workers', type=int, default=N_WORKERS, help="Processos de leitura")
+    args = parser.parse_args()
+
+    df = build_dataset(args.diretorio, args.workers)
+    if df.empty:
+        return
+    print(df.groupby(['Dispositivo', 'Sessao'], observed=True).size().rename('linhas').to_string())
+    save_dataset(df, args.saida)
+
+
+if __name__ == "__main__":
+    main()
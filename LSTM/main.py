@@ -4,45 +4,60 @@
 #      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
 #
 #   --> Função principal. Pipeline: normalizar, treinar, avaliar
+#       (subcomandos: 'treinar', padrão, 'verificar', que não carrega o TensorFlow,
+#       e 'experimento', que compara várias configurações de janela em uma execução)
 # =======================================================================================
 
-# Bibliotecas
+# Bibliotecas (TensorFlow, scikit-learn e matplotlib só são importados pelas etapas que os usam)
+import argparse
+import time
+
 import numpy as np
 import pandas as pd
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.utils.class_weight import compute_class_weight
 
 # Módulos Locais
 import data_loader
 import preprocessing
 import model as model_builder
 import plotting
+import evaluation
+import window_store
+import pyramid
 
 # 0. Configurações Principais -------------------------------------------------
-CSV_PATH = 'data/exemplo_artificial.csv'  # -> alterar para csv desejado
-
-# Divisão dos dados (8 para treino, 2 para teste)
-TRAIN_COLETAS = [1, 2, 3, 4, 5, 6, 7, 8]
-TEST_COLETAS = [9, 10]
-
-# Features que a LSTM usará
-FEATURES = ['Roll (x)', 'Pitch (y)', 'Yaw (z)', 'Magnitude']
-TARGET_COL = 'Tremor'
-
-# Configurações da Janela Deslizante
-WINDOW_SIZE = 50    # 10 amostras/segundo * 5 segundos = 50 amostras
-STEP = 10           # Desliza a janela em 1 segundo (10 amostras)
+# Dataset, divisão das coletas, features e janela (compartilhados com arch_search.py)
+from config import CSV_PATH, TRAIN_COLETAS, TEST_COLETAS, FEATURES, TARGET_COL, WINDOW_SIZE, STEP
 
 # Configurações do Modelo
 EPOCHS = 20
 BATCH_SIZE = 64
+VALIDATION_SPLIT = 0.2
 
+# Janelas lidas de shards em disco (para datasets maiores que a RAM)
+USE_WINDOW_STORE = False
+STORE_DIR = 'data/store'
+
+# Configurações de janela comparadas pelo subcomando 'experimento' (em amostras a 10 Hz).
+# 'level' k treina com a sequência resumida da pirâmide (médias de 2^k amostras)
+EXPERIMENT_CONFIGS = [
+    {'window_size': 20, 'step': 10, 'level': 0},    # 2 s
+    {'window_size': 50, 'step': 10, 'level': 0},    # 5 s (configuração do TinyML.ino)
+    {'window_size': 100, 'step': 10, 'level': 0},   # 10 s
+    {'window_size': 100, 'step': 10, 'level': 1},   # 10 s a 5 Hz (50 passos, custo de 5 s)
+]
+EXPERIMENT_EPOCHS = 5
+EXPERIMENT_SEED = 42
+EXPERIMENT_RESULTS = 'resultados_experimento_janelas.csv'
+
+
+def treinar(csv_path: str = CSV_PATH):
+    from sklearn.metrics import classification_report, confusion_matrix
+    from sklearn.utils.class_weight import compute_class_weight
 
-def main():
     print("Iniciando pipeline de detecção de tremor com LSTM...")
 
 # 1. Carregamento e pré-processamento dos dados -------------------------------
-    df = data_loader.load_data(CSV_PATH)
+    df = data_loader.load_data(csv_path)
     if df.empty:
         return
     df = data_loader.add_features(df)
@@ -54,32 +69,49 @@ def main():
     print("\n--- Etapa 1: Normalização ---")
     scaler = preprocessing.get_scaler(df_train, FEATURES)
     
-    df_train_scaled = preprocessing.scale_data(df_train, scaler, FEATURES)
-    df_test_scaled = preprocessing.scale_data(df_test, scaler, FEATURES)
-    
     # Plotar dados normalizados (da primeira coleta de teste)
-    primeira_coleta_teste = df_test_scaled[
-        df_test_scaled['ID_Coleta'] == TEST_COLETAS[0]
-    ]
+    primeira_coleta_teste = preprocessing.scale_data(
+        df_test[df_test['ID_Coleta'] == TEST_COLETAS[0]], scaler, FEATURES
+    )
     plotting.plot_normalized_data(primeira_coleta_teste, FEATURES, n_samples=2000)
 
-    # Criação das Sequências (Janelas)
-    print("Criando sequências (janelas) para treino...")
-    X_train, y_train = preprocessing.create_sequences(
-        df_train_scaled, FEATURES, TARGET_COL, WINDOW_SIZE, STEP
-    )
-    
-    print("Criando sequências (janelas) para teste...")
-    X_test, y_test = preprocessing.create_sequences(
-        df_test_scaled, FEATURES, TARGET_COL, WINDOW_SIZE, STEP
-    )
-    
-    print(f"Formato dos dados de treino (X): {X_train.shape}")
-    print(f"Formato dos dados de treino (y): {y_train.shape}")
-    print(f"Formato dos dados de teste (X): {X_test.shape}")
-    print(f"Formato dos dados de teste (y): {y_test.shape}")
+    if USE_WINDOW_STORE:
+        # Shards normalizados coleta a coleta (sem cópia normalizada do dataset inteiro),
+        # reaproveitados entre execuções enquanto coletas, features, janela e scaler não mudarem
+        train_store = window_store.open_or_write_store(
+            window_store.iter_collections(df_train),
+            window_store.collection_signatures(df_train, FEATURES, TARGET_COL),
+            scaler, FEATURES, TARGET_COL, WINDOW_SIZE, STEP, f"{STORE_DIR}/treino"
+        )
+        test_store = window_store.open_or_write_store(
+            window_store.iter_collections(df_test),
+            window_store.collection_signatures(df_test, FEATURES, TARGET_COL),
+            scaler, FEATURES, TARGET_COL, WINDOW_SIZE, STEP, f"{STORE_DIR}/teste"
+        )
+        y_train = window_store.window_labels(train_store)
+        y_test = window_store.window_labels(test_store)
+        print(f"Janelas de treino: {len(y_train)} | Janelas de teste: {len(y_test)}")
+    else:
+        df_train_scaled = preprocessing.scale_data(df_train, scaler, FEATURES)
+        df_test_scaled = preprocessing.scale_data(df_test, scaler, FEATURES)
+
+        # Criação das Sequências (Janelas)
+        print("Criando sequências (janelas) para treino...")
+        X_train, y_train = preprocessing.create_sequences(
+            df_train_scaled, FEATURES, TARGET_COL, WINDOW_SIZE, STEP
+        )
+        
+        print("Criando sequências (janelas) para teste...")
+        X_test, y_test = preprocessing.create_sequences(
+            df_test_scaled, FEATURES, TARGET_COL, WINDOW_SIZE, STEP
+        )
+        
+        print(f"Formato dos dados de treino (X): {X_train.shape}")
+        print(f"Formato dos dados de treino (y): {y_train.shape}")
+        print(f"Formato dos dados de teste (X): {X_test.shape}")
+        print(f"Formato dos dados de teste (y): {y_test.shape}")
 
-    if X_train.shape[0] == 0:
+    if len(y_train) == 0:
         print("Erro: Nenhuma sequência de treino foi criada. Verifique WINDOW_SIZE e os dados.")
         return
 
@@ -104,14 +136,30 @@ def main():
     model.summary()
     
     # Treinar
-    history = model.fit(
-        X_train, y_train,
-        epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
-        validation_split=0.2, # Usa 20% dos dados de TREINO para validação interna
-        class_weight=class_weight,
-        verbose=1
-    )
+    if USE_WINDOW_STORE:
+        # Mesma divisão do validation_split: as últimas janelas de treino validam
+        n_fit = int(len(y_train) * (1 - VALIDATION_SPLIT))
+        history = model.fit(
+            window_store.iter_batches(
+                train_store, BATCH_SIZE, subset=slice(None, n_fit), epochs=None, class_weight=class_weight
+            ),
+            steps_per_epoch=window_store.steps_for(train_store, BATCH_SIZE, slice(None, n_fit)),
+            validation_data=window_store.iter_batches(
+                train_store, BATCH_SIZE, shuffle=False, subset=slice(n_fit, None), epochs=None
+            ),
+            validation_steps=window_store.steps_for(train_store, BATCH_SIZE, slice(n_fit, None)),
+            epochs=EPOCHS,
+            verbose=1
+        )
+    else:
+        history = model.fit(
+            X_train, y_train,
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            validation_split=VALIDATION_SPLIT, # Usa 20% dos dados de TREINO para validação interna
+            class_weight=class_weight,
+            verbose=1
+        )
     
     # Plotar histórico de treino
     plotting.plot_training_history(history)
@@ -125,13 +173,23 @@ def main():
     print("\n--- Etapa 3: Avaliação nas Coletas de Teste ---")
     
     # Avaliação geral no conjunto de teste
-    loss, accuracy = model.evaluate(X_test, y_test, verbose=0)
+    if USE_WINDOW_STORE:
+        loss, accuracy = model.evaluate(
+            window_store.iter_batches(test_store, BATCH_SIZE, shuffle=False),
+            steps=window_store.steps_for(test_store, BATCH_SIZE),
+            verbose=0
+        )
+    else:
+        loss, accuracy = model.evaluate(X_test, y_test, verbose=0)
     print(f"Avaliação no Conjunto de Teste (Coletas {TEST_COLETAS}):")
     print(f"  Perda (Loss): {loss:.4f}")
     print(f"  Acurácia:     {accuracy*100:.2f}%")
     
     # Fazer previsões
-    y_pred_proba = model.predict(X_test)
+    if USE_WINDOW_STORE:
+        y_pred_proba = window_store.predict_store(model, test_store)
+    else:
+        y_pred_proba = model.predict(X_test)
     y_pred_classes = (y_pred_proba > 0.5).astype(int).flatten() # Converte probabilidade em 0 ou 1
     
     # Relatório de Classificação Detalhado
@@ -141,6 +199,13 @@ def main():
     print("Matriz de Confusão:")
     print(confusion_matrix(y_test, y_pred_classes))
     
+    # Métricas por evento (atraso de detecção, episódios perdidos e falsos)
+    # (só usa ID_Coleta, 'Time (s)' e o rótulo, então não precisa dos dados normalizados)
+    resumo_eventos, _ = evaluation.event_metrics(
+        df_test, y_pred_classes, TARGET_COL, WINDOW_SIZE, STEP
+    )
+    evaluation.print_event_report(resumo_eventos)
+    
     # Plotar previsões vs. realidade
     plotting.plot_predictions(
         y_test, 
@@ -148,5 +213,171 @@ def main():
         title=f"Previsão vs. Realidade (Coletas de Teste {TEST_COLETAS})"
     )
 
+
+# 4. Verificação do dataset (sem TensorFlow) ----------------------------------
+def verificar(csv_path: str = CSV_PATH):
+    """
+    Resume o dataset por coleta (linhas, duração, fração de tremor e janelas
+    geradas com WINDOW_SIZE/STEP) e confere as colunas e a divisão treino/teste.
+    """
+    df = data_loader.load_data(csv_path)
+    if df.empty:
+        return
+    df = data_loader.add_features(df)
+
+    faltando = [col for col in FEATURES + [TARGET_COL, 'ID_Coleta', 'Time (s)'] if col not in df.columns]
+    if faltando:
+        print(f"Erro: colunas ausentes {faltando}")
+        return
+
+    resumo = df.groupby('ID_Coleta', sort=False).agg(
+        linhas=(TARGET_COL, 'size'),
+        inicio=('Time (s)', 'min'),
+        fim=('Time (s)', 'max'),
+        tremor=(TARGET_COL, 'mean'),
+    )
+    resumo['janelas'] = [len(range(0, n, STEP)) if n > WINDOW_SIZE else 0
+                         for n in resumo['linhas'] - WINDOW_SIZE]
+
+    print("\n--- Tabela de Resultados (Verificação do Dataset) ---")
+    print("=" * 71)
+    print(f"| {'Coleta':>6} | {'Divisão':<7} | {'Linhas':>9} | {'Duração (min)':>13} | {'Tremor (%)':>10} | {'Janelas':>7} |")
+    print("-" * 71)
+    for r in resumo.itertuples():
+        divisao = 'treino' if r.Index in TRAIN_COLETAS else 'teste' if r.Index in TEST_COLETAS else '-'
+        print(f"| {r.Index:>6} | {divisao:<7} | {r.linhas:>9} | {(r.fim - r.inicio) / 60:>13.1f} "
+              f"| {r.tremor * 100:>10.2f} | {r.janelas:>7} |")
+    print("=" * 71)
+
+    ausentes = sorted(set(TRAIN_COLETAS + TEST_COLETAS) - set(resumo.index))
+    if ausentes:
+        print(f"Aviso: coletas configuradas mas ausentes no dataset: {ausentes}")
+    if df[FEATURES].isna().values.any():
+        print(f"Aviso: valores ausentes nas features ({int(df[FEATURES].isna().values.sum())})")
+
+
+# 5. Experimento com várias configurações de janela -------------------------
+def experimentar(csv_path: str = CSV_PATH):
+    """
+    Treina e avalia o modelo de referência para cada configuração de
+    EXPERIMENT_CONFIGS. Os dados são carregados, normalizados e organizados na
+    pirâmide uma única vez; cada configuração só extrai as suas janelas dela.
+    """
+    import tensorflow as tf
+    from sklearn.metrics import f1_score
+    from sklearn.utils.class_weight import compute_class_weight
+    from arch_search import estimar_custo
+
+    print("Iniciando experimento com várias configurações de janela...")
+
+    df = data_loader.load_data(csv_path)
+    if df.empty:
+        return
+    df = data_loader.add_features(df)
+    df_train, df_test = data_loader.split_data_by_coleta(df, TRAIN_COLETAS, TEST_COLETAS)
+
+    scaler = preprocessing.get_scaler(df_train, FEATURES)
+
+    n_levels = max(c['level'] for c in EXPERIMENT_CONFIGS) + 1
+    inicio = time.perf_counter()
+    pyramid_train = pyramid.build_pyramid(preprocessing.scale_data(df_train, scaler, FEATURES),
+                                          FEATURES, TARGET_COL, n_levels)
+    pyramid_test = pyramid.build_pyramid(preprocessing.scale_data(df_test, scaler, FEATURES),
+                                         FEATURES, TARGET_COL, n_levels)
+    print(f"Pirâmide ({n_levels} níveis) montada em {time.perf_counter() - inicio:.2f} s")
+
+    resultados = []
+    for config in EXPERIMENT_CONFIGS:
+        window_size, step, level = config['window_size'], config['step'], config['level']
+        nome = f"w{window_size}-s{step}-n{level}"
+        print(f"\n--- Configuração {nome} ---")
+
+        inicio = time.perf_counter()
+        X_train, y_train = pyramid.extract_windows(pyramid_train, window_size, step, level)
+        X_test, y_test = pyramid.extract_windows(pyramid_test, window_size, step, level)
+        tempo_janelas = time.perf_counter() - inicio
+        if len(y_train) == 0 or len(y_test) == 0:
+            print(f"Aviso: {nome} não gera janelas suficientes; configuração ignorada.")
+            continue
+
+        classes_unicas = np.unique(y_train)
+        class_weight = None
+        if len(classes_unicas) > 1:
+            weights = compute_class_weight('balanced', classes=classes_unicas, y=y_train)
+            class_weight = {cls: weight for cls, weight in zip(classes_unicas, weights)}
+
+        tf.keras.utils.set_random_seed(EXPERIMENT_SEED)
+        model = model_builder.compile_model(model_builder.build_model(X_train.shape[1], len(FEATURES)))
+
+        inicio = time.perf_counter()
+        model.fit(X_train, y_train, epochs=EXPERIMENT_EPOCHS, batch_size=BATCH_SIZE,
+                  validation_split=VALIDATION_SPLIT, class_weight=class_weight, verbose=0)
+        tempo_treino = time.perf_counter() - inicio
+
+        y_pred_classes = (model.predict(X_test, verbose=0) > 0.5).astype(int).flatten()
+        # (só usa ID_Coleta, 'Time (s)' e o rótulo, como em treinar)
+        resumo_eventos, _ = evaluation.event_metrics(
+            df_test, y_pred_classes, TARGET_COL, window_size, step
+        )
+
+        # Custo no Nano do modelo de referência (LSTM 64 -> LSTM 32 -> Dense 16)
+        custo = estimar_custo(
+            {'celula': 'lstm', 'unidades': (64, 32), 'frontend': None, 'janela': X_train.shape[1], 'densa': 16},
+            len(FEATURES)
+        )
+        resultados.append({
+            'nome': nome,
+            **config,
+            'passos_sequencia': X_train.shape[1],
+            'janelas_treino': len(y_train),
+            'tempo_janelas_s': tempo_janelas,
+            'tempo_treino_s': tempo_treino,
+            'macs': custo['macs'],
+            'arena_bytes': custo['arena_bytes'],
+            'latencia_nano_ms': custo['latencia_nano_ms'],
+            'acuracia': float(np.mean(y_pred_classes == y_test)),
+            'f1': f1_score(y_test, y_pred_classes, zero_division=0),
+            'atraso_mediano_s': resumo_eventos['atraso_mediano_s'],
+            'falsos_por_hora': resumo_eventos['falsos_por_hora'],
+        })
+        print(f"{nome}: acurácia {resultados[-1]['acuracia'] * 100:.2f}% em {tempo_treino:.1f} s de treino")
+
+    df_resultados = pd.DataFrame(resultados)
+    if df_resultados.empty:
+        return
+
+    print("\n--- Tabela de Resultados (Configurações de Janela) ---")
+    print("=" * 121)
+    print(f"| {'Configuração':<12} | {'Passos':>6} | {'Janelas':>7} | {'Janelas (s)':>11} | {'Treino (s)':>10} "
+          f"| {'MACs':>8} | {'Nano (ms)':>9} | {'Acurácia':>8} | {'F1':>5} | {'Atraso (s)':>10} | {'Falsos/h':>8} |")
+    print("-" * 121)
+    for r in df_resultados.itertuples():
+        print(f"| {r.nome:<12} | {r.passos_sequencia:>6} | {r.janelas_treino:>7} | {r.tempo_janelas_s:>11.3f} "
+              f"| {r.tempo_treino_s:>10.1f} | {r.macs:>8} | {r.latencia_nano_ms:>9.1f} | {r.acuracia * 100:>7.2f}% "
+              f"| {r.f1:>5.3f} | {r.atraso_mediano_s:>10.2f} | {r.falsos_por_hora:>8.2f} |")
+    print("=" * 121)
+    print(f"(Janelas (s): extração treino + teste da pirâmide; Nano: inferência estimada por decisão, "
+          f"{EXPERIMENT_EPOCHS} épocas cada)")
+
+    df_resultados.to_csv(EXPERIMENT_RESULTS, index=False)
+    print(f"Resultados salvos em '{EXPERIMENT_RESULTS}'")
+
+
+# 6. Execução Principal -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline de detecção de tremor com LSTM.")
+    parser.add_argument('comando', nargs='?', default='treinar', choices=['treinar', 'verificar', 'experimento'],
+                        help="'treinar' (padrão) roda o pipeline completo; 'verificar' só resume o dataset; "
+                             "'experimento' compara as configurações de EXPERIMENT_CONFIGS")
+    parser.add_argument('--csv', default=CSV_PATH, help="Dataset (.csv ou .parquet)")
+    args = parser.parse_args()
+
+    if args.comando == 'verificar':
+        verificar(args.csv)
+    elif args.comando == 'experimento':
+        experimentar(args.csv)
+    else:
+        treinar(args.csv)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,28 +6,65 @@
 #   --> Define (modela) a arquitetura LSTM
 # =======================================================================================
 
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout, Input
-from tensorflow.keras.optimizers import Adam
+from typing import TYPE_CHECKING
+
+# O TensorFlow só é importado quando um modelo é construído (inicialização rápida)
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Sequential
+
+# Camadas recorrentes disponíveis para as variantes (nome em tensorflow.keras.layers)
+CELULAS = {'lstm': 'LSTM', 'gru': 'GRU'}
 
 # 1. Criação do modelo --------------------------------------------------------
-def build_model(window_size: int, n_features: int) -> Sequential:
+def build_model(window_size: int, n_features: int) -> 'Sequential':
     """
     Constrói a arquitetura do modelo LSTM para classificação binária.
     """
+    # Arquitetura de referência: LSTM(64) -> LSTM(32) -> Dense(16)
+    return build_model_variant(window_size, n_features)
+
+
+def build_model_variant(window_size: int,
+                        n_features: int,
+                        celula: str = 'lstm',
+                        unidades: tuple = (64, 32),
+                        densa: int = 16,
+                        frontend: str | None = None,
+                        conv_filtros: int = 8,
+                        conv_kernel: int = 5,
+                        conv_stride: int = 2,
+                        dropout: float = 0.2) -> 'Sequential':
+    """
+    Constrói uma variante parametrizada da arquitetura recorrente.
+    'celula' escolhe LSTM ou GRU, 'unidades' define a largura de cada camada
+    recorrente e 'frontend="conv1d"' adiciona uma Conv1D com stride antes delas,
+    encurtando a sequência que as camadas recorrentes processam.
+    """
+    from tensorflow.keras import layers
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Conv1D, Dense, Dropout, Input
+
     model = Sequential() # Tipo sequencial
     
     model.add(Input(shape=(window_size, n_features)))
     
-    # Camada LSTM (pode-se adicionar mais)
-    model.add(LSTM(64, return_sequences=True))
-    model.add(Dropout(0.2))
+    # Front-end convolucional (opcional)
+    if frontend == 'conv1d':
+        model.add(Conv1D(conv_filtros, conv_kernel, strides=conv_stride, activation='relu'))
+    elif frontend is not None:
+        raise ValueError(f"Front-end desconhecido: {frontend}")
     
-    model.add(LSTM(32, return_sequences=False)) # Última LSTM não retorna sequência
-    model.add(Dropout(0.2))
+    # Camadas recorrentes (apenas a última não retorna sequência)
+    camada_recorrente = getattr(layers, CELULAS[celula])
+    for i, n_unidades in enumerate(unidades):
+        ultima = i == len(unidades) - 1
+        model.add(camada_recorrente(n_unidades, return_sequences=not ultima))
+        if dropout > 0:
+            model.add(Dropout(dropout))
     
     # Camada Densa para interpretação
-    model.add(Dense(16, activation='relu'))
+    if densa > 0:
+        model.add(Dense(densa, activation='relu'))
     
     # Camada de saída para classificação binária
     model.add(Dense(1, activation='sigmoid'))
@@ -35,10 +72,12 @@ def build_model(window_size: int, n_features: int) -> Sequential:
     return model
 
 # 2. Compila o modelo usando Adam ---------------------------------------------
-def compile_model(model: Sequential, learning_rate: float = 0.001):
+def compile_model(model: 'Sequential', learning_rate: float = 0.001):
     """
     Compila o modelo com otimizador, perda e métricas.
     """
+    from tensorflow.keras.optimizers import Adam
+
     model.compile(
         optimizer=Adam(learning_rate=learning_rate),
         loss='binary_crossentropy', # Correto para classificação binária
@@ -7,15 +7,18 @@
 # =======================================================================================
 
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+# O matplotlib só é importado quando um gráfico é gerado (inicialização rápida)
+
 # 1. Gráfico da normalização --------------------------------------------------
 def plot_normalized_data(df_coleta: pd.DataFrame, features: list, n_samples: int = 1000):
     """
     (Etapa 1) Plota os primeiros 'n_samples' dos dados normalizados de uma coleta.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(18, 8))
     
     plot_data = df_coleta.head(n_samples)
@@ -37,6 +40,8 @@ def plot_training_history(history):
     """
     (Etapa 2) Plota as curvas de perda (Loss) e acurácia (Accuracy) do treino.
     """
+    import matplotlib.pyplot as plt
+
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
     
     # Gráfico de Perda (Loss)
@@ -65,6 +70,8 @@ def plot_predictions(y_true: np.ndarray, y_pred_classes: np.ndarray, title: str,
     """
     (Etapa 3) Compara os rótulos verdadeiros com as previsões do modelo.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(18, 8))
     
     # Pega apenas uma fatia para visualização
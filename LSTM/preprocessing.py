@@ -6,21 +6,27 @@
 #   --> Normalização dos dados e criação de janelas de análise
 # =======================================================================================
 
+from typing import TYPE_CHECKING
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from scipy.stats import mode as scipy_mode
+
+# scikit-learn só é importado quando o scaler é criado (inicialização rápida)
+if TYPE_CHECKING:
+    from sklearn.preprocessing import StandardScaler
 
 # 1. Normalização através do Standard Scaler (Padronizador) -------------------
-def get_scaler(df_train: pd.DataFrame, features: list) -> StandardScaler:
+def get_scaler(df_train: pd.DataFrame, features: list) -> 'StandardScaler':
     """
     Cria e 'fita' um StandardScaler APENAS nos dados de treino.
     """
+    from sklearn.preprocessing import StandardScaler
+
     scaler = StandardScaler()
     scaler.fit(df_train[features])
     return scaler
 
-def scale_data(df: pd.DataFrame, scaler: StandardScaler, features: list) -> pd.DataFrame:
+def scale_data(df: pd.DataFrame, scaler: 'StandardScaler', features: list) -> pd.DataFrame:
     """Aplica um scaler já 'fitado' aos dados."""
     df_scaled = df.copy()
     df_scaled[features] = scaler.transform(df_scaled[features])
@@ -53,7 +59,9 @@ def create_sequences(df: pd.DataFrame,
             # Usamos a "moda" (valor mais frequente) da flag 'Tremor'
             # dentro da janela. Se 60% da janela for '1', o rótulo é '1'.
             window_labels = labels[i : i + window_size]
-            label = scipy_mode(window_labels, keepdims=False)[0]
+            # (empate fica com o menor valor, como em scipy.stats.mode)
+            valores, contagens = np.unique(window_labels, return_counts=True)
+            label = valores[np.argmax(contagens)]
             
             all_X.append(window)
             all_y.append(label)
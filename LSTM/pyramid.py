@@ -0,0 +1,105 @@
+# =================================/ pyramid.py /========================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Pirâmide multi-resolução das coletas normalizadas: somas acumuladas dos
+#       rótulos e níveis resumidos (médias em blocos de 2^k amostras),
+#       para extrair janelas de qualquer tamanho e passo sem recriar as sequências
+# =======================================================================================
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Níveis da pirâmide: nível k = média de blocos de 2^k amostras (10 Hz, 5 Hz, 2,5 Hz, ...)
+N_LEVELS = 4
+
+
+# 1. Construção da pirâmide ---------------------------------------------------
+def build_pyramid(df: pd.DataFrame,
+                  features: list,
+                  target_col: str,
+                  n_levels: int = N_LEVELS) -> list[dict]:
+    """
+    Monta, coleta a coleta (mesma ordem de create_sequences), as somas
+    acumuladas dos rótulos e os níveis resumidos. Cada nível é obtido das somas
+    acumuladas das features em O(n), sem percorrer janelas; essas somas (float64)
+    são descartadas em seguida, para não dobrar a memória da pirâmide.
+    """
+    pyramid = []
+    for coleta_id, positions in df.groupby('ID_Coleta', sort=False).indices.items():
+        values = df[features].values[positions].astype(np.float32)
+        labels = df[target_col].values[positions]
+
+        # Somas acumuladas com zero inicial: soma de [i, j) = P[j] - P[i]
+        # (float64 para não perder precisão ao subtrair somas de coletas longas)
+        prefix_X = np.zeros((len(values) + 1, len(features)), dtype=np.float64)
+        np.cumsum(values, axis=0, out=prefix_X[1:])
+        prefix_y = np.concatenate(([0], np.cumsum(labels, dtype=np.int64)))
+
+        levels = [values]
+        for k in range(1, n_levels):
+            fator = 2 ** k
+            m = len(values) // fator
+            soma_blocos = prefix_X[fator : m * fator + 1 : fator] - prefix_X[0 : m * fator : fator]
+            levels.append((soma_blocos / fator).astype(np.float32))
+
+        pyramid.append({
+            'id_coleta': coleta_id,
+            'n_samples': len(values),
+            'prefix_y': prefix_y,
+            'levels': levels,
+        })
+    return pyramid
+
+
+# 2. Extração de janelas ------------------------------------------------------
+def _window_starts(n_samples: int, window_size: int, step: int) -> np.ndarray:
+    """Inícios das janelas válidas (mesmo range de create_sequences)."""
+    return np.arange(0, n_samples - window_size, step, dtype=np.int64)
+
+
+def window_labels(pyramid: list[dict], window_size: int, step: int) -> np.ndarray:
+    """
+    Rótulo por maioria de cada janela, em O(1) por janela pelas somas
+    acumuladas (igual à moda de create_sequences para rótulos 0/1).
+    """
+    rotulos = []
+    for coleta in pyramid:
+        starts = _window_starts(coleta['n_samples'], window_size, step)
+        positivos = coleta['prefix_y'][starts + window_size] - coleta['prefix_y'][starts]
+        rotulos.append((2 * positivos > window_size).astype(np.int64))
+    return np.concatenate(rotulos) if rotulos else np.array([], dtype=np.int64)
+
+
+def extract_windows(pyramid: list[dict],
+                    window_size: int,
+                    step: int,
+                    level: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Extrai (X, y) para uma configuração de janela a partir da pirâmide.
+    'window_size' e 'step' são em amostras do sinal original; com 'level' k
+    cada janela é lida do nível resumido, com window_size / 2^k passos. As
+    janelas são vistas (sem cópia) do nível; só o resultado final é copiado.
+    """
+    fator = 2 ** level
+    if pyramid and level >= len(pyramid[0]['levels']):
+        raise ValueError(f"Nível {level} não existe na pirâmide.")
+    if window_size % fator or step % fator:
+        raise ValueError(f"window_size ({window_size}) e step ({step}) devem ser múltiplos de {fator} "
+                         f"para o nível {level}.")
+
+    passos = window_size // fator
+    janelas = []
+    for coleta in pyramid:
+        n_windows = len(_window_starts(coleta['n_samples'], window_size, step))
+        if n_windows == 0:
+            continue
+        # (n, n_features, passos) -> (n, passos, n_features), janela i começa em i * step / 2^k
+        vistas = sliding_window_view(coleta['levels'][level], passos, axis=0).transpose(0, 2, 1)
+        janelas.append(vistas[0 : n_windows * (step // fator) : step // fator])
+
+    n_features = pyramid[0]['levels'][0].shape[1] if pyramid else 0
+    X = np.concatenate(janelas) if janelas else np.empty((0, passos, n_features), dtype=np.float32)
+    return X, window_labels(pyramid, window_size, step)
@@ -0,0 +1,395 @@
+# ===============================/ window_store.py /=====================================
+#   - Feito por: Manuele Christófalo
+#   - Aplicado na pesquisa: "ANÁLISE COMPARATIVA DE ARDUINOS NA IMPLEMENTAÇÃO DE
+#      SISTEMAS EMBARCADOS PARA MONITORAMENTO DE TREMORES NA DOENÇA DE PARKINSON"
+#
+#   --> Armazenamento em disco (shards mapeados em memória) das coletas normalizadas,
+#       com índice das janelas válidas, para treinar e pontuar com dados maiores que a RAM
+# =======================================================================================
+
+import hashlib
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+# Shards abertos ao mesmo tempo durante o embaralhamento (limita o page cache usado)
+ACTIVE_SHARDS = 4
+
+# Leitura antecipada dos lotes em threads
+PREFETCH_THREADS = 2
+PREFETCH_DEPTH = 8          # Lotes preparados à frente do consumo
+
+META_FILE = 'meta.json'
+START_FILE = 'index_start.bin'   # int64: início de cada janela dentro do seu shard
+LABEL_FILE = 'index_label.bin'   # int8: rótulo por maioria de cada janela
+INDEX_FILES = (('starts', START_FILE, np.int64), ('labels', LABEL_FILE, np.int8))
+
+# Leitores do cabeçalho .npy por versão do formato (open_memmap grava 1.0 ou 2.0)
+_NPY_HEADERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+
+# 1. Escrita do store ---------------------------------------------------------
+def iter_collections(df: pd.DataFrame):
+    """Percorre um DataFrame em memória coleta a coleta (mesma ordem de create_sequences)."""
+    for coleta_id, positions in df.groupby('ID_Coleta', sort=False).indices.items():
+        yield df.iloc[positions]
+
+
+def _signature(df_coleta: pd.DataFrame, features: list, target_col: str) -> dict:
+    """Identifica a origem de um shard: coleta, número de linhas e hash dos valores."""
+    linhas = pd.util.hash_pandas_object(df_coleta[list(features) + [target_col]], index=False)
+    return {
+        'id_coleta': int(df_coleta['ID_Coleta'].iloc[0]),
+        'n_rows': len(df_coleta),
+        'hash': hashlib.blake2b(linhas.to_numpy().tobytes(), digest_size=16).hexdigest(),
+    }
+
+
+def collection_signatures(df: pd.DataFrame, features: list, target_col: str) -> list[dict]:
+    """Assinaturas das coletas de um DataFrame, na ordem em que viram shards."""
+    return [_signature(df_coleta, features, target_col) for df_coleta in iter_collections(df)]
+
+
+def write_store(collections,
+                scaler,
+                features: list,
+                target_col: str,
+                window_size: int,
+                step: int,
+                out_dir: str) -> dict:
+    """
+    Grava cada coleta (já carregada, ainda sem normalização) uma única vez como
+    um shard .npy: features normalizadas em float32 e rótulos em int8.
+    'collections' pode ser qualquer iterável de DataFrames, um por coleta, de
+    modo que o dataset inteiro nunca precisa estar em memória.
+
+    O índice (também em disco) guarda o início de cada janela válida e o seu
+    rótulo por maioria (igual à moda de create_sequences para 0/1). As janelas
+    de um shard são contíguas no índice, delimitadas por 'offsets'.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    # Remove shards de uma gravação anterior (podem sobrar se havia mais coletas)
+    for antigo in [*out.glob('shard_*_X.npy'), *out.glob('shard_*_y.npy')]:
+        antigo.unlink()
+    for arquivo in (META_FILE, START_FILE, LABEL_FILE):
+        (out / arquivo).unlink(missing_ok=True)
+
+    shards, offsets = [], [0]
+    with open(out / START_FILE, 'wb') as f_start, open(out / LABEL_FILE, 'wb') as f_label:
+        for shard_id, df_coleta in enumerate(collections):
+            n_rows = len(df_coleta)
+
+            x_file, y_file = f'shard_{shard_id:05d}_X.npy', f'shard_{shard_id:05d}_y.npy'
+            X = np.lib.format.open_memmap(out / x_file, mode='w+', dtype=np.float32, shape=(n_rows, len(features)))
+            X[:] = scaler.transform(df_coleta[features])
+            X.flush()
+            del X
+
+            labels = df_coleta[target_col].to_numpy(dtype=np.int8)
+            np.save(out / y_file, labels)
+
+            # Janelas válidas (mesmo range de create_sequences) e rótulo por maioria via soma acumulada
+            starts = np.arange(0, n_rows - window_size, step, dtype=np.int64)
+            acumulado = np.concatenate(([0], np.cumsum(labels, dtype=np.int64)))
+            positivos = acumulado[starts + window_size] - acumulado[starts]
+
+            f_start.write(starts.tobytes())
+            f_label.write((2 * positivos > window_size).astype(np.int8).tobytes())
+            offsets.append(offsets[-1] + len(starts))
+            shards.append({
+                **_signature(df_coleta, features, target_col),
+                'x_file': x_file,
+                'y_file': y_file,
+            })
+
+    meta = {
+        'features': list(features),
+        'target_col': target_col,
+        'window_size': window_size,
+        'step': step,
+        'scaler_mean': np.asarray(scaler.mean_).tolist(),
+        'scaler_scale': np.asarray(scaler.scale_).tolist(),
+        'offsets': offsets,
+        'shards': shards,
+    }
+    (out / META_FILE).write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    print(f"Store gravado em '{out_dir}': {len(shards)} shards, {offsets[-1]} janelas")
+    return open_store(out_dir)
+
+
+def store_matches(store_dir: str,
+                  signatures: list[dict],
+                  scaler,
+                  features: list,
+                  target_col: str,
+                  window_size: int,
+                  step: int) -> bool:
+    """
+    Indica se 'store_dir' já tem um store completo gravado a partir das mesmas
+    coletas ('signatures', ver collection_signatures) e com as mesmas features,
+    janela, passo e normalização (mesmo scaler ajustado).
+    """
+    meta_path = Path(store_dir) / META_FILE
+    if not meta_path.exists():
+        return False
+    meta = json.loads(meta_path.read_text())
+    gravadas = [{chave: shard.get(chave) for chave in ('id_coleta', 'n_rows', 'hash')} for shard in meta['shards']]
+    return (gravadas == signatures
+            and meta['features'] == list(features)
+            and meta['target_col'] == target_col
+            and meta['window_size'] == window_size
+            and meta['step'] == step
+            and np.allclose(meta.get('scaler_mean', np.nan), scaler.mean_)
+            and np.allclose(meta.get('scaler_scale', np.nan), scaler.scale_))
+
+
+def open_or_write_store(collections,
+                        signatures: list[dict],
+                        scaler,
+                        features: list,
+                        target_col: str,
+                        window_size: int,
+                        step: int,
+                        out_dir: str) -> dict:
+    """
+    Reaproveita o store de 'out_dir' quando compatível (ver store_matches);
+    caso contrário grava um novo, substituindo os shards antigos. As coletas
+    só são lidas do iterável se for preciso gravar.
+    """
+    if store_matches(out_dir, signatures, scaler, features, target_col, window_size, step):
+        store = open_store(out_dir)
+        print(f"Store reaproveitado de '{out_dir}': {len(store['shards'])} shards, {store['n_windows']} janelas")
+        return store
+    return write_store(collections, scaler, features, target_col, window_size, step, out_dir)
+
+
+# 2. Leitura do store ---------------------------------------------------------
+def _map_file(path: Path) -> mmap.mmap:
+    """Mapeia um arquivo só para leitura; o mapa é mantido para liberar páginas com madvise."""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_index(path: Path, dtype, n: int) -> tuple[mmap.mmap | None, np.ndarray]:
+    if n == 0:
+        return None, np.empty(0, dtype=dtype)
+    mapa = _map_file(path)
+    # Acesso é por shard, em ordem embaralhada: sem leitura antecipada, que traria
+    # (e deixaria no cache) o índice de shards vizinhos já liberados
+    if hasattr(mmap, 'MADV_RANDOM'):
+        mapa.madvise(mmap.MADV_RANDOM)
+    return mapa, np.frombuffer(mapa, dtype=dtype, count=n)
+
+
+def open_store(store_dir: str) -> dict:
+    """Abre os metadados e mapeia o índice; os shards são mapeados sob demanda."""
+    path = Path(store_dir)
+    store = json.loads((path / META_FILE).read_text())
+    store['dir'] = path
+    store['offsets'] = np.asarray(store['offsets'], dtype=np.int64)
+    store['n_windows'] = int(store['offsets'][-1])
+    store['index_maps'] = {}
+    for chave, arquivo, dtype in INDEX_FILES:
+        store['index_maps'][chave], store[chave] = _map_index(path / arquivo, dtype, store['n_windows'])
+    return store
+
+
+def window_labels(store: dict, subset: slice = slice(None)) -> np.ndarray:
+    """Rótulos das janelas (na ordem de create_sequences), sem tocar nos shards."""
+    return np.asarray(store['labels'][subset])
+
+
+def _open_shard(store: dict, shard_id: int) -> tuple[mmap.mmap, np.ndarray]:
+    """Mapeia o .npy das features de um shard: devolve o mapa e a matriz (n_rows, n_features)."""
+    with open(store['dir'] / store['shards'][shard_id]['x_file'], 'rb') as f:
+        shape, _, dtype = _NPY_HEADERS[np.lib.format.read_magic(f)](f)
+        inicio = f.tell()
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    X = np.frombuffer(mapa, dtype=dtype, count=int(np.prod(shape)), offset=inicio).reshape(shape)
+    return mapa, X
+
+
+def _release_shard(store: dict, shard_id: int, mapa: mmap.mmap | None):
+    """Devolve ao sistema as páginas de um shard que não será mais lido nesta época."""
+    if mapa is not None and hasattr(mmap, 'MADV_DONTNEED'):
+        mapa.madvise(mmap.MADV_DONTNEED)
+    if hasattr(os, 'posix_fadvise'):
+        fd = os.open(store['dir'] / store['shards'][shard_id]['x_file'], os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _release_index(store: dict, shard_id: int):
+    """Devolve as páginas do índice (inícios e rótulos) que cobrem as janelas de um shard."""
+    pagina = mmap.PAGESIZE
+    for chave, arquivo, dtype in INDEX_FILES:
+        tamanho = np.dtype(dtype).itemsize
+        inicio = int(store['offsets'][shard_id]) * tamanho
+        fim = int(store['offsets'][shard_id + 1]) * tamanho
+        if fim <= inicio:
+            continue
+        # Páginas inteiras: as das bordas são compartilhadas com shards vizinhos e
+        # só voltam ao cache se forem lidas de novo
+        inicio -= inicio % pagina
+        fim += -fim % pagina
+        mapa = store['index_maps'][chave]
+        if mapa is not None and hasattr(mmap, 'MADV_DONTNEED'):
+            mapa.madvise(mmap.MADV_DONTNEED, inicio, min(fim, len(mapa)) - inicio)
+        if hasattr(os, 'posix_fadvise'):
+            fd = os.open(store['dir'] / arquivo, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, inicio, fim - inicio, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def drop_page_cache(store: dict):
+    """Tira todos os shards do page cache (útil para medir leituras a frio)."""
+    for shard_id in range(len(store['shards'])):
+        _release_shard(store, shard_id, None)
+        _release_index(store, shard_id)
+
+
+# 3. Ordem das janelas e montagem dos lotes -----------------------------------
+def _epoch_groups(store: dict, subset: slice, shuffle: bool, seed: int, active_shards: int):
+    """
+    Gera, grupo a grupo, as janelas de uma época e os shards do grupo. Com
+    'shuffle', embaralha os shards e depois as janelas dentro de cada grupo de
+    'active_shards' shards, de modo que só um grupo é lido por vez e a memória
+    usada depende do tamanho do grupo, não do dataset. 'subset' é uma faixa
+    contínua de janelas (mesma ordem de create_sequences).
+    """
+    inicio, fim, _ = subset.indices(store['n_windows'])
+    offsets = store['offsets']
+    n_shards = len(store['shards'])
+
+    rng = np.random.default_rng(seed)
+    if shuffle:
+        permutacao = rng.permutation(n_shards)
+    else:
+        permutacao, active_shards = np.arange(n_shards), 1
+
+    for g in range(0, n_shards, active_shards):
+        shards = permutacao[g : g + active_shards]
+        janelas = np.concatenate([
+            np.arange(max(offsets[s], inicio), min(offsets[s + 1], fim)) for s in shards
+        ])
+        if len(janelas) == 0:
+            continue
+        yield (rng.permutation(janelas) if shuffle else janelas), shards
+
+
+def _batches(grupos, batch_size: int):
+    """
+    Corta a sequência de grupos em lotes de 'batch_size' janelas. Junto de cada
+    lote vão os shards cujas janelas terminam nele (podem ser liberados depois).
+    """
+    pedacos, n, liberar = [], 0, []
+    for janelas, shards in grupos:
+        while len(janelas):
+            pedaco, janelas = janelas[: batch_size - n], janelas[batch_size - n :]
+            pedacos.append(pedaco)
+            n += len(pedaco)
+            if n == batch_size:
+                if len(janelas) == 0:
+                    liberar.extend(shards)
+                yield np.concatenate(pedacos), liberar
+                pedacos, n, liberar = [], 0, []
+        if n:
+            liberar.extend(shards)
+    if n:
+        yield np.concatenate(pedacos), liberar
+
+
+def _gather(store: dict, mapas: dict, janelas: np.ndarray) -> np.ndarray:
+    """Copia um lote de janelas (n, window_size, n_features) dos shards mapeados."""
+    W = store['window_size']
+    shard = np.searchsorted(store['offsets'], janelas, side='right') - 1
+    start = store['starts'][janelas]
+    X = np.empty((len(janelas), W, len(store['features'])), dtype=np.float32)
+    for shard_id in np.unique(shard):
+        if shard_id not in mapas:
+            mapas.setdefault(shard_id, _open_shard(store, shard_id))
+        _, X_shard = mapas[shard_id]
+        sel = shard == shard_id
+        X[sel] = X_shard[start[sel, None] + np.arange(W)]
+    return X
+
+
+def iter_batches(store: dict,
+                 batch_size: int,
+                 shuffle: bool = True,
+                 seed: int = 0,
+                 subset: slice = slice(None),
+                 epochs: int | None = 1,
+                 class_weight: dict | None = None,
+                 active_shards: int = ACTIVE_SHARDS,
+                 prefetch_threads: int = PREFETCH_THREADS,
+                 prefetch_depth: int = PREFETCH_DEPTH):
+    """
+    Gera lotes (X, y) lidos dos shards, com leitura antecipada em threads.
+    'epochs=None' repete indefinidamente (formato esperado por model.fit com
+    steps_per_epoch); cada época usa a semente 'seed + época'. Com 'class_weight'
+    gera (X, y, pesos), já que model.fit não aceita class_weight com geradores.
+    """
+    labels = store['labels']
+    pesos = None
+    if class_weight is not None:
+        pesos = np.array([class_weight.get(0, 1.0), class_weight.get(1, 1.0)], dtype=np.float32)
+
+    epoca = 0
+    with ThreadPoolExecutor(max_workers=prefetch_threads) as executor:
+        while epochs is None or epoca < epochs:
+            grupos = _epoch_groups(store, subset, shuffle, seed + epoca, active_shards)
+            mapas, pendentes = {}, deque()
+
+            for janelas, liberar in _batches(grupos, batch_size):
+                # Mantém até 'prefetch_depth' lotes sendo preparados à frente
+                pendentes.append((executor.submit(_gather, store, mapas, janelas), janelas, liberar))
+                if len(pendentes) < prefetch_depth:
+                    continue
+                yield _entregar(store, mapas, pendentes.popleft(), labels, pesos)
+
+            while pendentes:
+                yield _entregar(store, mapas, pendentes.popleft(), labels, pesos)
+            epoca += 1
+
+
+def _entregar(store: dict, mapas: dict, pendente: tuple, labels: np.ndarray, pesos: np.ndarray | None) -> tuple:
+    """Espera um lote ficar pronto e libera os shards que ele encerrou."""
+    futuro, janelas, liberar = pendente
+    X = futuro.result()
+    y = np.asarray(labels[janelas])
+    for shard_id in liberar:
+        if shard_id in mapas:
+            _release_shard(store, shard_id, mapas.pop(shard_id)[0])
+            _release_index(store, shard_id)
+    return (X, y) if pesos is None else (X, y, pesos[y])
+
+
+def steps_for(store: dict, batch_size: int, subset: slice = slice(None)) -> int:
+    """Número de lotes por época (steps_per_epoch / validation_steps)."""
+    return -(-len(range(store['n_windows'])[subset]) // batch_size)
+
+
+# 4. Pontuação em lote --------------------------------------------------------
+def predict_store(model, store: dict, batch_size: int = 1024) -> np.ndarray:
+    """
+    Probabilidades do modelo para todas as janelas, na ordem de create_sequences,
+    prontas para evaluation.event_metrics.
+    """
+    saidas = [
+        np.asarray(model.predict_on_batch(lote[0])).reshape(-1)
+        for lote in iter_batches(store, batch_size, shuffle=False)
+    ]
+    return np.concatenate(saidas) if saidas else np.array([], dtype=np.float32)
@@ -8,9 +8,14 @@
 #       (plataforma parada) para encontrar possíveis ruídos ou lags atrelados aos sensores.
 #  ===================================================================================================
 
-import pandas as pd
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
+
+# Leitura compartilhada dos logs do SD (LSTM/ingestion.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LSTM'))
+import ingestion
 
 # --- PARÂMETROS DO TESTE ---
 ARQUIVO_UNO = 'data/pUNO_TesteC_1.CSV'
@@ -21,15 +26,8 @@ ARQUIVO_NANO = 'data/pNANO_TesteC_1.CSV'
 def carregar_dados_estaticos(arquivo):
     """Carrega o CSV, renomeia colunas e converte o tempo para minutos."""
     
-    df = pd.read_csv(arquivo, header=0, on_bad_lines='skip')
-    
-    # Renomeia as colunas
-    df.rename(columns={
-        'Roll (x)': 'roll',
-        ' Pitch (Y)': 'pitch',
-        ' Yaw (Z)': 'yaw',
-        ' Time (s)': 'tempo_s'
-    }, inplace=True)
+    # Leitura com cabeçalho normalizado e linhas truncadas do SD descartadas
+    df = ingestion.read_log(arquivo).rename(columns=ingestion.SHORT_NAMES)
     
     
     # Converte tempo de segundos para minutos
@@ -38,6 +36,11 @@ def carregar_dados_estaticos(arquivo):
 
 
 # 2. Execução Principal -------------------------------------------------------
+parser = argparse.ArgumentParser(description="Análise de estabilidade (ruído e deriva) do UNO e do NANO.")
+parser.add_argument('--sem-grafico', action='store_true',
+                    help="Só imprime as tabelas (não importa o matplotlib)")
+args = parser.parse_args()
+
 print("--- Script 3: Análise de Estabilidade (Ruído e Deriva) ---")
 
 df_uno = carregar_dados_estaticos(ARQUIVO_UNO)
@@ -76,12 +79,16 @@ print(f"| Deriva Total em 'Yaw' | {deriva_total_uno:<15.2f} | {deriva_total_nano
 print("=" * 55)
 print(f"(Valores próximos de 0 indicam maior estabilidade)")
 
-plt.figure(figsize=(12, 6))
-plt.title('Análise de Deriva (Drift) do Eixo "Yaw" em Repouso')
-plt.plot(df_uno['tempo_min'], df_uno['yaw_drift'], 'r-', label='pUNO_v2 (Sem Magnetômetro)')
-plt.plot(df_nano['tempo_min'], df_nano['yaw_drift'], 'b-', label='pNANO_v2 (Com Magnetômetro e Filtro de Kalman)')
-plt.xlabel('Tempo (minutos)')
-plt.ylabel('Deriva Acumulada em "Yaw" (Graus)')
-plt.legend()
-plt.grid(True)
-plt.show()
\ No newline at end of file
+# --- Saída Gráfica (Visualização) ---
+if not args.sem_grafico:
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+    plt.title('Análise de Deriva (Drift) do Eixo "Yaw" em Repouso')
+    plt.plot(df_uno['tempo_min'], df_uno['yaw_drift'], 'r-', label='pUNO_v2 (Sem Magnetômetro)')
+    plt.plot(df_nano['tempo_min'], df_nano['yaw_drift'], 'b-', label='pNANO_v2 (Com Magnetômetro e Filtro de Kalman)')
+    plt.xlabel('Tempo (minutos)')
+    plt.ylabel('Deriva Acumulada em "Yaw" (Graus)')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
@@ -9,11 +9,14 @@
 #  ===================================================================================================
 
 
-import pandas as pd
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_squared_error
+
+# Leitura compartilhada dos logs do SD (LSTM/ingestion.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LSTM'))
+import ingestion
 
 # --- PARÂMETROS DO TESTE ---
 ARQUIVO_UNO = 'data/pUNO_TesteB_10g.csv'
@@ -26,15 +29,7 @@ EIXO_MOVIMENTO = 'pitch'  #Eixo em que o servo moveu
 # 1. Carrega e prepara os dados -----------------------------------------------
 def carregar_e_preparar(arquivo):
     """Carrega o CSV, renomeia colunas e extrai o sinal e o tempo."""
-    df = pd.read_csv(arquivo, header=0)
-    
-    # Renomeia as colunas
-    df.rename(columns={
-        'Roll (x)': 'roll',
-        ' Pitch (Y)': 'pitch',
-        ' Yaw (Z)': 'yaw',
-        ' Time (s)': 'tempo_s'
-    }, inplace=True)
+    df = ingestion.read_log(arquivo).rename(columns=ingestion.SHORT_NAMES)
     
     sinal = df[EIXO_MOVIMENTO].values
     tempo = df['tempo_s'].values
@@ -42,6 +37,11 @@ def carregar_e_preparar(arquivo):
 
 
 # 2. Execução Principal -------------------------------------------------------
+parser = argparse.ArgumentParser(description="Análise de fidelidade (RMSE vs. senoide) do UNO e do NANO.")
+parser.add_argument('--sem-grafico', action='store_true',
+                    help="Só imprime as tabelas (não importa o matplotlib)")
+args = parser.parse_args()
+
 print("--- Script 2: Análise de Fidelidade (Domínio do Tempo) ---")
 
 sinal_uno, tempo_uno = carregar_e_preparar(ARQUIVO_UNO)
@@ -54,16 +54,17 @@ sinal_truth = GROUND_TRUTH_AMP * np.sin(2 * np.pi * GROUND_TRUTH_FREQ * tempo_re
 
 # B. Normalizar os Sinais (StandardScaler) ----
 # Isso é crucial para comparar a FORMA da onda, não a amplitude absoluta.
-scaler = StandardScaler()
+# Média e desvio do Ground Truth aplicados aos três sinais (mesmo que um
+# StandardScaler ajustado no Ground Truth, sem importar o scikit-learn)
+media_truth, desvio_truth = sinal_truth.mean(), sinal_truth.std()
 
-# Reshape (-1, 1) é necessário para o scaler
-sinal_truth_scaled = scaler.fit_transform(sinal_truth.reshape(-1, 1))
-sinal_uno_scaled = scaler.transform(sinal_uno.reshape(-1, 1))
-sinal_nano_scaled = scaler.transform(sinal_nano.reshape(-1, 1))
+sinal_truth_scaled = (sinal_truth - media_truth) / desvio_truth
+sinal_uno_scaled = (sinal_uno - media_truth) / desvio_truth
+sinal_nano_scaled = (sinal_nano - media_truth) / desvio_truth
 
 # C. Calcular RMSE (Erro Médio Quadrático) ----
-rmse_uno = np.sqrt(mean_squared_error(sinal_truth_scaled, sinal_uno_scaled))
-rmse_nano = np.sqrt(mean_squared_error(sinal_truth_scaled, sinal_nano_scaled))
+rmse_uno = np.sqrt(np.mean((sinal_truth_scaled - sinal_uno_scaled) ** 2))
+rmse_nano = np.sqrt(np.mean((sinal_truth_scaled - sinal_nano_scaled) ** 2))
 
 
 # --- Saída Quantitativa (Tabela no Console) ---
@@ -76,16 +77,19 @@ print("=" * 40)
 print("(Valores menores de RMSE indicam maior fidelidade à forma da onda)")
 
 # --- Saída Gráfica (Visualização) ---
-plt.figure(figsize=(15, 7))
-plt.title(f'Comparação de Fidelidade de Sinal (Normalizado) - {GROUND_TRUTH_FREQ} Hz')
-plt.plot(tempo_ref, sinal_truth_scaled, 'k--', label='Ground Truth (Senoide Perfeita)', linewidth=2)
-plt.plot(tempo_ref, sinal_uno_scaled, 'r-', label=f'pUNO (RMSE: {rmse_uno:.4f})', alpha=0.7)
-plt.plot(tempo_ref, sinal_nano_scaled, 'b-', label=f'pNANO (RMSE: {rmse_nano:.4f})', alpha=0.7)
-
-# Limita o plot para ver o detalhe (ex: 2 segundos)
-plt.xlim(5, 7) 
-plt.xlabel('Tempo (s)')
-plt.ylabel('Sinal Normalizado (Z-score)')
-plt.legend()
-plt.grid(True)
-plt.show()
\ No newline at end of file
+if not args.sem_grafico:
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(15, 7))
+    plt.title(f'Comparação de Fidelidade de Sinal (Normalizado) - {GROUND_TRUTH_FREQ} Hz')
+    plt.plot(tempo_ref, sinal_truth_scaled, 'k--', label='Ground Truth (Senoide Perfeita)', linewidth=2)
+    plt.plot(tempo_ref, sinal_uno_scaled, 'r-', label=f'pUNO (RMSE: {rmse_uno:.4f})', alpha=0.7)
+    plt.plot(tempo_ref, sinal_nano_scaled, 'b-', label=f'pNANO (RMSE: {rmse_nano:.4f})', alpha=0.7)
+
+    # Limita o plot para ver o detalhe (ex: 2 segundos)
+    plt.xlim(5, 7) 
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Sinal Normalizado (Z-score)')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
@@ -9,10 +9,14 @@
 #  ===================================================================================================
 
 
-import pandas as pd
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.fft import fft, fftfreq
+
+# Leitura compartilhada dos logs do SD (LSTM/ingestion.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LSTM'))
+import ingestion
 
 # --- PARÂMETROS DO TESTE ---
 # Altere estes valores para cada ensaio
@@ -24,15 +28,7 @@ GROUND_TRUTH_FREQ = 2.0  # Frequência (em Hz) que o servo motor gerou (2, 3, 4
 # 1. Carrega e prepara os dados -----------------------------------------------
 def carregar_dados(arquivo):
     """Carrega o CSV, renomeia colunas e calcula a taxa de amostragem (fs)."""
-    df = pd.read_csv(arquivo, header=0) 
-    
-    # Renomeia as colunas
-    df.rename(columns={
-        'Roll (x)': 'roll',
-        ' Pitch (Y)': 'pitch',
-        ' Yaw (Z)': 'yaw',
-        ' Time (s)': 'tempo_s'
-    }, inplace=True)
+    df = ingestion.read_log(arquivo).rename(columns=ingestion.SHORT_NAMES)
 
     # Calcula a Magnitude
     df['magnitude'] = np.sqrt(df['roll']**2 + df['pitch']**2 + df['yaw']**2)
@@ -54,8 +50,8 @@ def analisar_fft(df, fs):
     sinal = sinal - np.mean(sinal)
     
     # Calcula a FFT
-    yf = fft(sinal)
-    xf = fftfreq(N, 1 / fs) # Gera os "bins" de frequência
+    yf = np.fft.fft(sinal)
+    xf = np.fft.fftfreq(N, 1 / fs) # Gera os "bins" de frequência
     
     # Pega apenas a metade positiva do espectro
     xf_positive = xf[:N//2]
@@ -69,6 +65,11 @@ def analisar_fft(df, fs):
 
 
 # 3. Execução Principal -------------------------------------------------------
+parser = argparse.ArgumentParser(description="Análise de frequência (FFT) do UNO e do NANO.")
+parser.add_argument('--sem-grafico', action='store_true',
+                    help="Só imprime as tabelas (não importa o matplotlib)")
+args = parser.parse_args()
+
 print("--- Script 1: Análise de Frequência (FFT) ---")
 
 # Carrega e processa dados
@@ -95,16 +96,19 @@ print("=" * 60)
 
 
 # --- Saída Gráfica (Visualização) ---
-plt.figure(figsize=(12, 6))
-plt.title(f'Análise de Frequência (FFT) - Teste de {GROUND_TRUTH_FREQ} Hz')
-plt.plot(xf_uno, yf_uno, 'r-', label=f'pUNO (Pico: {freq_uno:.2f} Hz)', alpha=0.8)
-plt.plot(xf_nano, yf_nano, 'b-', label=f'pNANO (Pico: {freq_nano:.2f} Hz)', alpha=0.8)
-plt.axvline(x=GROUND_TRUTH_FREQ, color='k', linestyle='--', label=f'Ground Truth ({GROUND_TRUTH_FREQ} Hz)')
-
-# Limita o eixo X para focar na área de interesse (ex: 0 a 10 Hz)
-plt.xlim(0, 10) 
-plt.xlabel('Frequência (Hz)')
-plt.ylabel('Magnitude Normalizada')
-plt.legend()
-plt.grid(True)
-plt.show()
\ No newline at end of file
+if not args.sem_grafico:
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+    plt.title(f'Análise de Frequência (FFT) - Teste de {GROUND_TRUTH_FREQ} Hz')
+    plt.plot(xf_uno, yf_uno, 'r-', label=f'pUNO (Pico: {freq_uno:.2f} Hz)', alpha=0.8)
+    plt.plot(xf_nano, yf_nano, 'b-', label=f'pNANO (Pico: {freq_nano:.2f} Hz)', alpha=0.8)
+    plt.axvline(x=GROUND_TRUTH_FREQ, color='k', linestyle='--', label=f'Ground Truth ({GROUND_TRUTH_FREQ} Hz)')
+
+    # Limita o eixo X para focar na área de interesse (ex: 0 a 10 Hz)
+    plt.xlim(0, 10) 
+    plt.xlabel('Frequência (Hz)')
+    plt.ylabel('Magnitude Normalizada')
+    plt.legend()
+    plt.grid(True)
+    plt.show()